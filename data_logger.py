@@ -24,6 +24,10 @@
 import os
 import traceback
 import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from colorama import init, Fore, Back, Style
 from libs.DL3021 import *
 from libs.RigolDP832 import *
@@ -43,10 +47,59 @@ from libs.loading import *
 # Constants and global variables
 _MAX_FILENAMES = 100
 _VALUE_PADDING = 40
+_WRITE_BATCH_ROWS = 32  # With batch_writes: data rows collected in memory before they are written out together
+_WRITE_BATCH_SECONDS = 5  # With batch_writes: longest time data rows are held in memory before they are written out
+_FILE_BUFFER_SIZE = 1 << 16  # Bytes buffered by the open file before a write to disk
+_MAX_READ_THREADS = 8  # Devices read at the same time by get_data(concurrent=True)
 _ERROR_STYLE = Fore.RED + Style.BRIGHT + "\rError! "
 _SUCCESS_STYLE = Fore.GREEN + Style.BRIGHT + "\r"
 _WARNING_STYLE = Fore.YELLOW + Style.BRIGHT + "\rWarning! "
 
+
+"""
+Formats a number of seconds as HH:MM:SS.mmm (wrapping at 24 hours).
+
+Args:
+    seconds (float): The number of seconds, e.g. an elapsed time or a time.time() value.
+
+Returns:
+    str: The formatted time of day.
+"""
+def _format_hms(seconds):
+
+    ms = round(seconds * 1000) % 86400000
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+"""
+Writes a batch of data rows to the file and flushes the file's buffer to the OS.
+
+Args:
+    f (file): The open data file.
+    batch (str): The data rows, joined.
+"""
+def _write_batch(f, batch):
+
+    f.write(batch)
+    f.flush()
+
+"""
+Writes data rows still held in memory to the file and flushes it. Runs when a logger is
+garbage collected or the interpreter exits without close_file() (e.g. after Ctrl-C).
+
+Args:
+    f (file): The open data file.
+    rows (list): The pending data rows.
+"""
+def _write_pending_rows(f, rows):
+
+    if not f.closed:
+        f.write(''.join(rows))
+        rows.clear()
+        f.flush()
+
 """
 A class for data logging and measurement.
 
@@ -64,20 +117,38 @@ class data_logger:
 
     """
     Initializes an instance of the data_logger class.
+
+    By default every data row is written to the file and handed to the OS as soon as it is read.
+
+    Args:
+        background_write (bool, optional): Write batches of data rows to the file from a separate
+            thread, so a slow disk does not hold up the next measurement. Defaults to False.
+        batch_writes (bool, optional): Collect up to 32 data rows, or 5 seconds' worth, in memory and
+            write them together. Fewer writes, but a hard kill, crash or power loss loses the rows
+            not yet written (rows are still saved on Ctrl-C or a normal exit). Defaults to False.
     """
-    def __init__(self):
+    def __init__(self, background_write=False, batch_writes=False):
 
         init(autoreset=True)
         self.labels   = []
         self.devices  = []
         self.items    = []
         self.channels = []
+        self.readers  = []
         self.max_label_length = 0
         self.beginnning_of_file = True
         self.file_open = False
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.filename_warning_given = False
         self.loading = loading()
+        self.pending_rows = []
+        self.last_flush = time.monotonic()
+        self.finalizer = None
+        self.executor = None
+        self.background_write = background_write
+        self.batch_writes = batch_writes
+        self.writer = None
+        self.pending_writes = deque()
 
     """
     Establishes a connection to the specified device.
@@ -163,6 +234,10 @@ class data_logger:
             self.devices.append(time)
             self.items.append(item)
             self.channels.append(None)
+            if item == 'elapsed':
+                self.readers.append(lambda: time.monotonic() - self.start_time)
+            else:
+                self.readers.append(time.time)
 
         elif device_object.status != 'Connected':
             error_message = f"Device '{device_name}' is not connected."
@@ -173,19 +248,25 @@ class data_logger:
             self.devices.append(device_object)
             self.items.append(item)
             self.channels.append(channel)
+            if channel is None:
+                self.readers.append(partial(device_object.get, item))
+            else:
+                self.readers.append(partial(device_object.get, item, channel))
             
 
     """
     Writes the data from connected devices to a file.
 
     Args:
-        print_to_terminal (bool, optional): Specifies whether to print the data to the terminal.
+        print_to_terminal (bool, optional): Specifies whether to print the elapsed time and the data to the terminal.
             Defaults to True.
+        concurrent (bool, optional): Read different devices at the same time, each in its own thread.
+            Items of the same device are still read in order. Defaults to False.
 
     Raises:
         IOError: If the file is not open or not writable, or if there is an error writing the data.
     """
-    def get_data(self, print_to_terminal=True):
+    def get_data(self, print_to_terminal=True, concurrent=False):
 
         try:
             if not self.file_open:
@@ -195,57 +276,50 @@ class data_logger:
                 if user_input.lower() == 'y':
                     self.new_file()            
 
-            new_row = ""
+            header = []
+            row = []
 
             if self.beginnning_of_file:
-                self.start_time = time.time()
+                self.start_time = time.monotonic()
 
             # Print elapsed time
-            elapsed_time = time.time() - self.start_time
-            elapsed_time = time.strftime('%H:%M:%S', time.gmtime(elapsed_time))+f"{elapsed_time%1:.3f}"[1:]
-            print(f"Getting new measurements (Elapsed Time: {elapsed_time})")
+            if print_to_terminal:
+                print(f"Getting new measurements (Elapsed Time: {_format_hms(time.monotonic() - self.start_time)})")
+
+            if concurrent:
+                results = self.__read_concurrently()
 
             # Write data for each connected device
             for i, device in enumerate(self.devices):
                 try:
-                    if device is time:
-                        if self.items[i] == 'elapsed':
-                            value = time.time() - self.start_time
-                        else:
-                            value = time.time()
-                    elif self.channels[i] is None:
-                        value = device.get(self.items[i])
+                    if concurrent:
+                        value, error = results[i]
+                        if error is not None:
+                            raise error
                     else:
-                        value = device.get(self.items[i], self.channels[i])
+                        value = self.readers[i]()
 
                     if self.file_open:
 
                         if self.beginnning_of_file:
                             if isinstance(value, tuple):
-                                self.f.write(f"{self.labels[i]}\t{self.labels[i]}_e")
+                                header.append(f"{self.labels[i]}\t{self.labels[i]}_e")
                             else:
-                                self.f.write(f"{self.labels[i]}")
-                            if i != len(self.labels) - 1:
-                                self.f.write('\t')
-                            else:
-                                self.f.write('\n')
+                                header.append(f"{self.labels[i]}")
 
                         if isinstance(value, tuple):
-                            new_row += f"{value[0]:.10f}\t{value[1]:.10f}"
+                            row.append(f"{value[0]:.10f}\t{value[1]:.10f}")
                         else:
                             if isinstance(value, float):
-                                new_row += f"{value:.10f}"
+                                row.append(f"{value:.10f}")
                             else:
-                                new_row += f"{value}"
-
-                        if i != len(self.devices) - 1:
-                            new_row += '\t'
+                                row.append(f"{value}")
 
                     if print_to_terminal:
                         label_padding = ' ' * (self.max_label_length - len(self.labels[i]))
                         if device is time:
                             # value to value in HH:MM:SS format with milliseconds
-                            value = time.strftime('%H:%M:%S', time.gmtime(value))+f"{value%1:.3f}"[1:]
+                            value = _format_hms(value)
                             if self.items[i] == 'current':
                                 value = value + '-GMT'
 
@@ -264,14 +338,93 @@ class data_logger:
                     raise ValueError(_ERROR_STYLE + error_message + f"\n{e}")
 
             if self.file_open:
-                self.f.write(new_row + '\n')
+                if self.beginnning_of_file:
+                    self.pending_rows.append('\t'.join(header) + '\n')
+                self.pending_rows.append('\t'.join(row) + '\n')
                 self.beginnning_of_file = False
+                if (not self.batch_writes
+                        or len(self.pending_rows) >= _WRITE_BATCH_ROWS
+                        or time.monotonic() - self.last_flush >= _WRITE_BATCH_SECONDS):
+                    self.flush()
                 
         except IOError:
             error_message = f"Failed to write data to the file '{self.filename}'."
             raise IOError(_ERROR_STYLE + error_message)
         
     
+    """
+    Reads all items, overlapping the reads of different devices in a thread pool.
+
+    Returns:
+        list: A (value, exception) pair per item, in the order the items were added.
+    """
+    def __read_concurrently(self):
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=_MAX_READ_THREADS)
+
+        # One task per device, so a device never sees overlapping queries
+        groups = {}
+        for i, device in enumerate(self.devices):
+            groups.setdefault(id(device), []).append(i)
+
+        def read_group(indices):
+            group_results = []
+            for i in indices:
+                try:
+                    group_results.append((i, (self.readers[i](), None)))
+                except Exception as e:
+                    group_results.append((i, (None, e)))
+            return group_results
+
+        results = [None] * len(self.devices)
+        for future in [self.executor.submit(read_group, indices) for indices in groups.values()]:
+            for i, result in future.result():
+                results[i] = result
+        return results
+
+
+    """
+    Writes the buffered data rows to the file in a single write and hands them on to the OS.
+
+    With background_write, the write is handed to the writer thread instead and an error
+    from an earlier write is raised here.
+
+    Raises:
+        IOError: If there is an error writing the data.
+    """
+    def flush(self):
+
+        self.last_flush = time.monotonic()
+        while self.pending_writes and self.pending_writes[0].done():
+            self.pending_writes.popleft().result()
+
+        if self.pending_rows:
+            batch = ''.join(self.pending_rows)
+            self.pending_rows.clear()
+            if self.background_write:
+                if self.writer is None:
+                    self.writer = ThreadPoolExecutor(max_workers=1)
+                self.pending_writes.append(self.writer.submit(_write_batch, self.f, batch))
+            else:
+                _write_batch(self.f, batch)
+
+
+    """
+    Waits for the writer thread to finish all handed-over writes.
+
+    Raises:
+        IOError: If there is an error writing the data.
+    """
+    def __finish_writes(self):
+
+        if self.writer is not None:
+            self.writer.shutdown()
+            self.writer = None
+        while self.pending_writes:
+            self.pending_writes.popleft().result()
+
+
     """
     Finds the next available filename by appending a number to the base filename.
 
@@ -348,7 +501,8 @@ class data_logger:
             self.filename = self.__find_next_filename(filename)
             
             # Open the file in write mode
-            self.f = open(self.filename, 'w')
+            self.f = open(self.filename, 'w', buffering=_FILE_BUFFER_SIZE)
+            self.finalizer = weakref.finalize(self, _write_pending_rows, self.f, self.pending_rows)
             self.beginnning_of_file = True  
             self.file_open = True
             print(_SUCCESS_STYLE + f"Opened file '{self.filename}'.")
@@ -370,13 +524,46 @@ class data_logger:
     def close_file(self):
 
         try:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
             if self.f.writable():
-                self.f.close()
-                self.file_open = False
+                try:
+                    self.flush()
+                    self.__finish_writes()
+                finally:
+                    self.finalizer.detach()
+                    self.f.close()
+                    self.file_open = False
                 print(_SUCCESS_STYLE + f"File '{self.filename}' saved.")
             else:
                 print(_WARNING_STYLE + "No filestream available to save.")
         except IOError:
             error_message = f"Failed to save file '{self.filename}'."
             raise IOError(_ERROR_STYLE + error_message)
-        
\ No newline at end of file
+        
+
+    """
+    Enters a with-block, returning the logger itself.
+
+    Example usage:
+
+        with data_logger() as logger:
+            logger.new_file("output.txt")
+            ...
+    """
+    def __enter__(self):
+
+        return self
+
+
+    """
+    Leaves a with-block, flushing and closing the file if one is still open.
+
+    Exceptions raised inside the block are not suppressed.
+    """
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+
+        if self.file_open:
+            self.close_file()
+        return False
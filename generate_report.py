@@ -28,20 +28,26 @@ import time
 import webbrowser
 from pathlib import Path
 from typing import Optional, List, Dict, Any
-import json
 import base64
 
 # Web server imports
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 # Data processing imports
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.utils import PlotlyJSONEncoder
+
+# Plot thresholds, trace decimation and results parsing shared with the static report generator
+from generate_static_report import (_MARKERS_MAX_POINTS, _WEBGL_MIN_POINTS, _downsample_minmax,
+                                    _parse_results, _MEASUREMENT_KEYS, _MEASUREMENT_ROW)
+
+# Waveform CSV columns, read as float32 (half the memory of the float64 default)
+_WAVEFORM_DTYPES = {'Time_s': np.float32, 'Voltage_V': np.float32, 'Value': np.float32}
 
 class MeasurementReportGenerator:
     """Generates HTML reports from oscilloscope measurement data."""
@@ -50,6 +56,7 @@ class MeasurementReportGenerator:
         self.input_dir = Path(input_dir)
         self.port = port
         self.app = FastAPI()
+        self.server = None  # uvicorn.Server, created by start_server()
         self.setup_routes()
         
         # Data storage
@@ -71,10 +78,13 @@ class MeasurementReportGenerator:
             if self.ch1_data is None:
                 raise HTTPException(status_code=404, detail="CH1 data not found")
             
+            t, y = _downsample_minmax(self.ch1_data['Time_s'].to_numpy(),
+                                      self.ch1_data['Voltage_V'].to_numpy())
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=self.ch1_data['Time_s'],
-                y=self.ch1_data['Voltage_V'],
+            scatter = go.Scattergl if len(self.ch1_data) > _WEBGL_MIN_POINTS else go.Scatter
+            fig.add_trace(scatter(
+                x=t,
+                y=y,
                 mode='lines',
                 name='CH1 Voltage',
                 line=dict(color='#1f77b4', width=1)
@@ -89,7 +99,8 @@ class MeasurementReportGenerator:
                 height=400
             )
             
-            return JSONResponse(content=json.loads(json.dumps(fig, cls=PlotlyJSONEncoder)))
+            # Serialized once by Plotly (orjson engine when installed) and sent as-is
+            return Response(content=fig.to_json(validate=False), media_type="application/json")
         
         @self.app.get("/plot/m1")
         async def get_m1_plot():
@@ -97,11 +108,15 @@ class MeasurementReportGenerator:
             if self.m1_data is None:
                 raise HTTPException(status_code=404, detail="M1 data not found")
             
+            n_points = len(self.m1_data)
+            t, y = _downsample_minmax(self.m1_data['Time_s'].to_numpy(),
+                                      self.m1_data['Value'].to_numpy())
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=self.m1_data['Time_s'],
-                y=self.m1_data['Value'],
-                mode='lines+markers',
+            scatter = go.Scattergl if n_points > _WEBGL_MIN_POINTS else go.Scatter
+            fig.add_trace(scatter(
+                x=t,
+                y=y,
+                mode='lines+markers' if n_points <= _MARKERS_MAX_POINTS else 'lines',
                 name='M1 Math Function',
                 line=dict(color='#ff7f0e', width=2),
                 marker=dict(size=4)
@@ -116,7 +131,8 @@ class MeasurementReportGenerator:
                 height=400
             )
             
-            return JSONResponse(content=json.loads(json.dumps(fig, cls=PlotlyJSONEncoder)))
+            # Serialized once by Plotly (orjson engine when installed) and sent as-is
+            return Response(content=fig.to_json(validate=False), media_type="application/json")
     
     def load_data(self):
         """Load all measurement data from input directory."""
@@ -137,12 +153,14 @@ class MeasurementReportGenerator:
         # Load waveform data
         if ch1_files:
             print(f"Loading CH1 data from: {ch1_files[0]}")
-            self.ch1_data = pd.read_csv(ch1_files[0])
+            self.ch1_data = pd.read_csv(ch1_files[0], usecols=['Time_s', 'Voltage_V'],
+                                        dtype=_WAVEFORM_DTYPES, engine='c')
             print(f"  CH1: {len(self.ch1_data)} samples")
         
         if m1_files:
             print(f"Loading M1 data from: {m1_files[0]}")
-            self.m1_data = pd.read_csv(m1_files[0])
+            self.m1_data = pd.read_csv(m1_files[0], usecols=['Time_s', 'Value'],
+                                       dtype=_WAVEFORM_DTYPES, engine='c')
             print(f"  M1: {len(self.m1_data)} samples")
         
         # Load screenshot
@@ -153,45 +171,7 @@ class MeasurementReportGenerator:
     def load_measurement_results(self, txt_file: Path):
         """Parse measurement results from txt file."""
         with open(txt_file, 'r') as f:
-            content = f.read()
-        
-        # Extract basic info
-        lines = content.split('\n')
-        self.measurement_data = {
-            'timestamp': '',
-            'statistics_mode': '',
-            'raw_response': '',
-            'measurements': []
-        }
-        
-        current_measurement = None
-        
-        for line in lines:
-            line = line.strip()
-            
-            if line.startswith('Timestamp:'):
-                self.measurement_data['timestamp'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Statistics Mode:'):
-                self.measurement_data['statistics_mode'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Raw Response:'):
-                self.measurement_data['raw_response'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Measurement ') and ':' in line:
-                # New measurement
-                if current_measurement:
-                    self.measurement_data['measurements'].append(current_measurement)
-                
-                name = line.split(':', 1)[1].strip()
-                current_measurement = {'name': name, 'values': {}}
-                
-            elif current_measurement and ':' in line and any(x in line for x in ['Current:', 'Minimum:', 'Maximum:', 'Mean:', 'Std Dev:', 'Count:']):
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                current_measurement['values'][key] = value
-        
-        # Add the last measurement
-        if current_measurement:
-            self.measurement_data['measurements'].append(current_measurement)
+            self.measurement_data = _parse_results(f.read())
     
     def load_screenshot(self, screenshot_file: Path):
         """Load and encode screenshot as base64."""
@@ -409,21 +389,13 @@ class MeasurementReportGenerator:
         """
         
         # Generate measurements table rows
-        measurements_rows = ""
-        for measurement in self.measurement_data['measurements']:
-            name = measurement['name']
-            values = measurement['values']
-            measurements_rows += f"""
-                <tr>
-                    <td><strong>{name}</strong></td>
-                    <td>{values.get('Current', 'N/A')}</td>
-                    <td>{values.get('Minimum', 'N/A')}</td>
-                    <td>{values.get('Maximum', 'N/A')}</td>
-                    <td>{values.get('Mean', 'N/A')}</td>
-                    <td>{values.get('Std Dev', 'N/A')}</td>
-                    <td>{values.get('Count', 'N/A')}</td>
-                </tr>
-            """
+        measurements_rows = [
+            _MEASUREMENT_ROW.format(
+                measurement['name'],
+                *[measurement['values'].get(key, 'N/A') for key in _MEASUREMENT_KEYS]
+            )
+            for measurement in self.measurement_data['measurements']
+        ]
         
         # Generate screenshot section
         screenshot_section = ""
@@ -441,7 +413,7 @@ class MeasurementReportGenerator:
             statistics_mode=self.measurement_data.get('statistics_mode', 'Unknown'),
             input_dir=str(self.input_dir),
             raw_response=self.measurement_data.get('raw_response', ''),
-            measurements_rows=measurements_rows,
+            measurements_rows=''.join(measurements_rows),
             screenshot_section=screenshot_section,
             port=self.port,
             generation_time=time.strftime('%Y-%m-%d %H:%M:%S')
@@ -455,15 +427,20 @@ class MeasurementReportGenerator:
         print(f"HTML report generated: {output_path.absolute()}")
         return output_path
     
-    def start_server(self):
-        """Start the FastAPI server in a separate thread."""
-        def run_server():
-            uvicorn.run(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+    def start_server(self, startup_timeout: float = 10.0):
+        """Start the FastAPI server in a separate thread and wait until it is serving."""
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
         
-        server_thread = threading.Thread(target=run_server, daemon=True)
+        server_thread = threading.Thread(target=self.server.run, daemon=True)
         server_thread.start()
         print(f"FastAPI server starting on http://localhost:{self.port}")
-        time.sleep(2)  # Give server time to start
+        
+        # Return as soon as the server is up (instead of a fixed 2 s sleep), or
+        # as soon as its thread dies, e.g. because the port is already in use
+        deadline = time.monotonic() + startup_timeout
+        while not self.server.started and server_thread.is_alive() and time.monotonic() < deadline:
+            server_thread.join(timeout=0.05)
         return server_thread
 
 def main():
@@ -532,12 +509,15 @@ Examples:
         
         print("\nPress Ctrl+C to stop the server and exit.")
         
-        # Keep server running
+        # Keep server running; join() wakes up as soon as the server thread
+        # exits, the timeout only keeps Ctrl+C responsive
         try:
-            while True:
-                time.sleep(1)
+            while server_thread.is_alive():
+                server_thread.join(timeout=1)
         except KeyboardInterrupt:
             print("\nShutting down...")
+            generator.server.should_exit = True
+            server_thread.join(timeout=5)
             
     except Exception as e:
         print(f"Error generating report: {e}")
@@ -66,835 +66,335 @@ import sys
 import argparse
 import time
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, List, Dict, Any
-import json
-import base64
+import copy
+import fnmatch
+import hashlib
+import io
+import mmap
+import os
+import re
+import shutil
+import string
+import zlib
 
 # Data processing imports
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.offline as pyo
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import io
+# plotly (interactive plots), Pillow (static fallback plots) and markdown
+# (notes) are imported lazily where they are used, so runs that need none of
+# them (--help, up-to-date reports) don't pay for them
 
-# Markdown processing
+# Fast JSON decoding (optional)
 try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
 except ImportError:
-    MARKDOWN_AVAILABLE = False
+    import json
+    _json_loads = json.loads
 
-class StaticMeasurementReportGenerator:
-    """Generates static HTML reports from oscilloscope measurement data."""
-    
-    def __init__(self, input_dir: str):
-        self.input_dir = Path(input_dir)
-        
-        # Data storage
-        self.measurement_data = {}
-        self.channel_data = {}  # Will store data for all channels (CH1-CH4, M1)
-        self.channel_metadata = {}  # Will store channel labels and settings
-        self.screenshot_b64 = None
-        self.measurement_notes_html = ""
-        self.csv_data_b64 = {}  # Will store base64-encoded CSV data for embedding
-        
-    def load_channel_metadata(self):
-        """Load channel metadata (labels, colors) if available."""
-        metadata_file = self.input_dir / "channel_metadata.json"
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    self.channel_metadata = metadata.get("channels", {})
-                    print(f"Loaded channel metadata: {self.channel_metadata}")
-            except Exception as e:
-                print(f"Warning: Could not load channel metadata: {e}")
-                self.channel_metadata = {}
-        else:
-            print("No channel metadata file found, using defaults")
-            self.channel_metadata = {}
+# SIMD base64 encoding of the embedded payloads (optional, same API as base64)
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
 
-    def load_data(self):
-        """Load all measurement data from input directory."""
-        print(f"Loading data from: {self.input_dir}")
-        
-        # Load channel metadata first
-        self.load_channel_metadata()
-        
-        # Find files - support both old and new filename patterns
-        txt_files = list(self.input_dir.glob("results_*.txt"))
-        if not txt_files:
-            txt_files = list(self.input_dir.glob("measurement_results_*.txt"))
-        
-        ch1_files = list(self.input_dir.glob("ch1_waveform_*.csv"))
-        m1_files = list(self.input_dir.glob("m1_waveform_*.csv"))
-        
-        screenshot_files = list(self.input_dir.glob("screenshot_*.png"))
-        if not screenshot_files:
-            screenshot_files = list(self.input_dir.glob("measurement_results_screenshot_*.png"))
-        
-        if not txt_files:
-            raise FileNotFoundError("No measurement results txt file found (tried both 'results_*.txt' and 'measurement_results_*.txt' patterns)")
-        
-        # Load measurement results
-        self.load_measurement_results(txt_files[0])
-        
-        # Load waveform data dynamically for all channels
-        channel_patterns = {
-            'CH1': 'ch1_*.csv',
-            'CH2': 'ch2_*.csv', 
-            'CH3': 'ch3_*.csv',
-            'CH4': 'ch4_*.csv',
-            'M1': 'm1_*.csv'
-        }
-        
-        for channel, pattern in channel_patterns.items():
-            channel_files = list(self.input_dir.glob(pattern))
-            if channel_files:
-                print(f"Loading {channel} data from: {channel_files[0]}")
-                self.channel_data[channel] = pd.read_csv(channel_files[0])
-                print(f"  {channel}: {len(self.channel_data[channel])} samples")
-                
-                # Also store the raw CSV data as base64 for embedding
-                with open(channel_files[0], 'rb') as f:
-                    csv_content = f.read()
-                    self.csv_data_b64[channel] = base64.b64encode(csv_content).decode('utf-8')
-        
-        # Load screenshot
-        if screenshot_files:
-            print(f"Loading screenshot: {screenshot_files[0]}")
-            self.load_screenshot(screenshot_files[0])
-        
-        # Load measurement notes
-        self.measurement_notes_html = self.load_measurement_notes()
-    
-    def load_measurement_results(self, txt_file: Path):
-        """Parse measurement results from txt file."""
-        with open(txt_file, 'r') as f:
-            content = f.read()
-        
-        # Extract basic info
-        lines = content.split('\n')
-        self.measurement_data = {
-            'timestamp': '',
-            'statistics_mode': '',
-            'raw_response': '',
-            'measurements': [],
-            'config': {}
-        }
-        
-        current_measurement = None
-        
-        for line in lines:
-            line = line.strip()
-            
-            if line.startswith('Timestamp:'):
-                self.measurement_data['timestamp'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Statistics Mode:'):
-                self.measurement_data['statistics_mode'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Raw Response:'):
-                self.measurement_data['raw_response'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Acquisition Mode:'):
-                self.measurement_data['config']['acquisition_mode'] = line.split(':', 1)[1].strip()
-            elif line.startswith('Time Scale:'):
-                self.measurement_data['config']['time_scale'] = line.split(':', 1)[1].strip()
-            # Parse channel configuration dynamically
-            elif 'Scale:' in line and any(f'CH{i}' in line for i in range(1, 5)):
-                for ch_num in range(1, 5):
-                    if line.startswith(f'CH{ch_num} Scale:'):
-                        self.measurement_data['config'][f'ch{ch_num}_scale'] = line.split(':', 1)[1].strip()
-                        break
-            elif 'Bandwidth Limit:' in line and any(f'CH{i}' in line for i in range(1, 5)):
-                for ch_num in range(1, 5):
-                    if line.startswith(f'CH{ch_num} Bandwidth Limit:'):
-                        self.measurement_data['config'][f'ch{ch_num}_bandwidth_limit'] = line.split(':', 1)[1].strip()
-                        break
-            elif 'Coupling:' in line and any(f'CH{i}' in line for i in range(1, 5)):
-                for ch_num in range(1, 5):
-                    if line.startswith(f'CH{ch_num} Coupling:'):
-                        self.measurement_data['config'][f'ch{ch_num}_coupling'] = line.split(':', 1)[1].strip()
-                        break
-            elif 'Offset:' in line and any(f'CH{i}' in line for i in range(1, 5)):
-                for ch_num in range(1, 5):
-                    if line.startswith(f'CH{ch_num} Offset:'):
-                        self.measurement_data['config'][f'ch{ch_num}_offset'] = line.split(':', 1)[1].strip()
-                        break
-            elif 'Display:' in line and any(f'CH{i}' in line for i in range(1, 5)):
-                for ch_num in range(1, 5):
-                    if line.startswith(f'CH{ch_num} Display:'):
-                        self.measurement_data['config'][f'ch{ch_num}_display'] = line.split(':', 1)[1].strip()
-                        break
-            elif line.startswith('Measurement ') and ':' in line:
-                # New measurement
-                if current_measurement:
-                    self.measurement_data['measurements'].append(current_measurement)
-                
-                name = line.split(':', 1)[1].strip()
-                current_measurement = {'name': name, 'values': {}}
-                
-            elif current_measurement and ':' in line and any(x in line for x in ['Current:', 'Minimum:', 'Maximum:', 'Mean:', 'Std Dev:', 'Count:']):
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                current_measurement['values'][key] = value
-        
-        # Add the last measurement
-        if current_measurement:
-            self.measurement_data['measurements'].append(current_measurement)
-    
-    def load_screenshot(self, screenshot_file: Path):
-        """Load and encode screenshot as base64."""
-        with open(screenshot_file, 'rb') as f:
-            screenshot_data = f.read()
-        self.screenshot_b64 = base64.b64encode(screenshot_data).decode('utf-8')
-    
-    def _convert_image_to_base64(self, image_path):
-        """Convert an image file to a base64 data URI."""
-        try:
-            # Handle relative paths by making them relative to input directory
-            if not Path(image_path).is_absolute():
-                full_path = self.input_dir / image_path
-            else:
-                full_path = Path(image_path)
-            
-            if full_path.exists() and full_path.is_file():
-                # Determine MIME type based on file extension
-                ext = full_path.suffix.lower()
-                mime_types = {
-                    '.png': 'image/png',
-                    '.jpg': 'image/jpeg',
-                    '.jpeg': 'image/jpeg',
-                    '.gif': 'image/gif',
-                    '.bmp': 'image/bmp',
-                    '.webp': 'image/webp',
-                    '.svg': 'image/svg+xml'
+# Oscilloscope trace colors, also used for the channel tile banners
+CHANNEL_COLORS = {
+    'CH1': 'yellow',
+    'CH2': 'lime',
+    'CH3': 'cyan',
+    'CH4': 'magenta',
+    'M1': 'indigo'
+}
+
+# Waveform CSV value column and axis label per channel
+_CHANNEL_YCOL = {
+    **{f'CH{ch}': ('Voltage_V', 'Voltage (V)') for ch in range(1, 5)},
+    'M1': ('Value', 'Value'),
+}
+
+# Waveform CSV file name pattern per channel
+_CHANNEL_FILE_PATTERNS = {channel: f'{channel.lower()}_*.csv' for channel in CHANNEL_COLORS}
+
+# Header fields of results files and the measurement_data keys they fill
+_RESULTS_FIELDS = {
+    'Timestamp': 'timestamp',
+    'Statistics Mode': 'statistics_mode',
+    'Raw Response': 'raw_response',
+}
+
+# Configuration fields of results files and their measurement_data['config'] keys
+_RESULTS_CONFIG_KEYS = {
+    'Acquisition Mode': 'acquisition_mode',
+    'Time Scale': 'time_scale',
+    **{f'CH{ch} {setting}': f"ch{ch}_{setting.lower().replace(' ', '_')}"
+       for ch in range(1, 5)
+       for setting in ('Scale', 'Bandwidth Limit', 'Coupling', 'Offset', 'Display')},
+}
+
+# "Key: value" lines understood in results_*.txt files, scanned in one pass;
+# all other lines are skipped by the regex engine
+_RESULTS_RE = re.compile(
+    r'^[ \t]*(?:'
+    r'(?P<field>' + '|'.join(map(re.escape, {**_RESULTS_FIELDS, **_RESULTS_CONFIG_KEYS})) + r')'
+    r'|(?P<measurement>Measurement [^:\n]*)'
+    r'|(?P<stat>Current|Minimum|Maximum|Mean|Std Dev|Count)'
+    r'):(?P<value>.*)$',
+    re.MULTILINE
+)
+
+# Interactive plots are ~1000 px wide; traces longer than this many min/max
+# bins are reduced to their envelope before being serialized into the HTML
+_PLOT_MAX_BINS = 2000
+
+# Above these trace lengths markers are dropped (one SVG node per sample) and
+# WebGL is used instead of SVG (judged on the capture length for waveforms)
+_MARKERS_MAX_POINTS = 500
+_WEBGL_MIN_POINTS = 5000
+
+# Download handler for gzip-embedded CSVs: inflate the data: URI in the
+# browser and save the plain CSV (without support, the link saves the .gz)
+_GZIP_CSV_DOWNLOAD_JS = """
+            <script>
+                function downloadGzipCsv(link) {
+                    if (!('DecompressionStream' in window)) {
+                        return true;
+                    }
+                    fetch(link.href)
+                        .then(function (response) {
+                            var csv = response.body.pipeThrough(new DecompressionStream('gzip'));
+                            return new Response(csv).blob();
+                        })
+                        .then(function (blob) {
+                            var a = document.createElement('a');
+                            a.href = URL.createObjectURL(new Blob([blob], {type: 'text/csv'}));
+                            a.download = link.getAttribute('download').replace(/\\.gz$/, '');
+                            document.body.appendChild(a);
+                            a.click();
+                            a.remove();
+                            setTimeout(function () { URL.revokeObjectURL(a.href); }, 1000);
+                        });
+                    return false;
                 }
-                mime_type = mime_types.get(ext, 'image/png')
-                
-                # Read and encode the image
-                with open(full_path, 'rb') as f:
-                    image_data = f.read()
-                b64_data = base64.b64encode(image_data).decode('utf-8')
-                
-                print(f"Embedded image: {image_path} ({len(image_data)} bytes)")
-                return f"data:{mime_type};base64,{b64_data}"
-            else:
-                print(f"Warning: Image file not found: {image_path}")
-                return image_path  # Return original path as fallback
-        except Exception as e:
-            print(f"Error converting image {image_path} to base64: {e}")
-            return image_path  # Return original path as fallback
-    
-    def _embed_images_in_html(self, html_content):
-        """Replace image src attributes with base64 data URIs in HTML."""
-        import re
-        
-        def replace_img_src(match):
-            full_tag = match.group(0)
-            src = match.group(1)
-            
-            # Skip if already a data URI
-            if src.startswith('data:'):
-                return full_tag
-                
-            # Convert to base64 data URI
-            data_uri = self._convert_image_to_base64(src)
-            
-            # Replace the src attribute value in the full tag
-            return full_tag.replace(f'src="{src}"', f'src="{data_uri}"').replace(f"src='{src}'", f'src="{data_uri}"')
-        
-        # Find all img tags and replace their src attributes
-        pattern = r'<img[^>]*src=["\']([^"\']+)["\'][^>]*>'
-        return re.sub(pattern, replace_img_src, html_content)
+            </script>
+"""
 
-    def load_measurement_notes(self):
-        """Load measurement notes from markdown file and convert to HTML."""
-        notes_file = self.input_dir / "measurement_notes.md"
-        notes_html = ""
-        
-        if notes_file.exists():
-            try:
-                with open(notes_file, 'r', encoding='utf-8') as f:
-                    notes_content = f.read().strip()
-                
-                if notes_content:
-                    if MARKDOWN_AVAILABLE:
-                        # Convert markdown to HTML
-                        import markdown
-                        md = markdown.Markdown(extensions=['extra', 'codehilite'])
-                        notes_html = md.convert(notes_content)
-                    else:
-                        # Fallback: simple HTML conversion
-                        notes_html = self._simple_markdown_to_html(notes_content)
-                        
-                    # Embed images as base64 data URIs for standalone HTML
-                    notes_html = self._embed_images_in_html(notes_html)
-                        
-                    print(f"Loaded measurement notes: {len(notes_content)} characters")
-                else:
-                    print("Measurement notes file is empty")
-            except Exception as e:
-                print(f"Error loading measurement notes: {e}")
-                notes_html = ""
-        else:
-            print("No measurement notes file found")
-            
-        return notes_html
-    
-    def _simple_markdown_to_html(self, text):
-        """Simple markdown to HTML converter for fallback."""
-        import re
-        
-        # Convert basic markdown to HTML
-        # Headers
-        text = re.sub(r'^### (.*$)', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^## (.*$)', r'<h2>\1</h2>', text, flags=re.MULTILINE)
-        text = re.sub(r'^# (.*$)', r'<h1>\1</h1>', text, flags=re.MULTILINE)
-        
-        # Bold and italic
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
-        
-        # Images - convert to base64 data URIs for embedding
-        def replace_image(match):
-            alt_text = match.group(1)
-            image_path = match.group(2)
-            data_uri = self._convert_image_to_base64(image_path)
-            return f'<img src="{data_uri}" alt="{alt_text}" style="max-width: 100%; height: auto;">'
-        
-        text = re.sub(r'!\[(.*?)\]\((.*?)\)', replace_image, text)
-        
-        # Links
-        text = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', text)
-        
-        # Line breaks and paragraphs
-        paragraphs = text.split('\n\n')
-        paragraphs = [f'<p>{p.replace(chr(10), "<br>")}</p>' for p in paragraphs if p.strip()]
-        text = '\n'.join(paragraphs)
-        
-        return text
-    
-    def create_channel_plot(self, channel):
-        """Create waveform plot for any channel."""
-        if channel not in self.channel_data or self.channel_data[channel] is None:
-            return f"<p>No {channel} data available</p>"
-        
-        data = self.channel_data[channel]
-        print(f"Creating {channel} plot with {len(data)} points")
-        
-        # Determine column names and colors based on channel type
-        channel_colors = {
-            'CH1': 'yellow',
-            'CH2': 'lime', 
-            'CH3': 'cyan',
-            'CH4': 'magenta',
-            'M1': 'indigo'
-        }
-        
-        if channel.startswith('CH'):
-            y_col = 'Voltage_V'
-            y_label = 'Voltage (V)'
-            color = channel_colors.get(channel, '#1f77b4')
-        else:  # M1 or other math channels
-            y_col = 'Value'
-            y_label = 'Value'
-            color = channel_colors.get(channel, 'orange')
-        
-        print(f"Time range: {data['Time_s'].min():.6f} to {data['Time_s'].max():.6f} s")
-        print(f"{y_label} range: {data[y_col].min():.6f} to {data[y_col].max():.6f}")
-        
-        return self._create_plot_with_fallback(channel, data, y_col, y_label, color)
-    
-    def _create_plot_with_fallback(self, channel, data, y_col, y_label, color):
-        """Create plot with static fallback."""
-        # Get custom channel label if available
-        channel_label = self.channel_metadata.get(channel, {}).get("label", channel)
-        
-        try:
-            print(f"  Creating interactive {channel} plot...")
-            # Try interactive plot first
-            fig = go.Figure()
-            mode = 'lines+markers' if channel.startswith('M') else 'lines'
-            marker_size = 4 if channel.startswith('M') else 2
-            
-            fig.add_trace(go.Scatter(
-                x=data['Time_s'],
-                y=data[y_col],
-                mode=mode,
-                name=f'{channel_label} {y_label.split("(")[0].strip()}',
-                line=dict(color=color, width=2),
-                marker=dict(size=marker_size) if 'markers' in mode else None
-            ))
-            
-            fig.update_layout(
-                title=f"{channel_label} Waveform ({len(data)} samples)",
-                xaxis_title="Time (s)",
-                yaxis_title=y_label,
-                hovermode='x unified',
-                template='plotly_white',
-                height=400,
-                showlegend=True
-            )
-            
-            print(f"  Generating {channel} Plotly HTML...")
-            interactive_plot = pyo.plot(fig, output_type='div', include_plotlyjs='inline')
-            print(f"  {channel} interactive plot generated successfully")
-            
-            # Create static fallback
-            print(f"  Creating {channel} static fallback...")
-            static_plot_b64 = self._create_static_plot(channel, data, y_col, y_label, color, mode, channel_label)
-            
-            if static_plot_b64:
-                return f'''
-                <div class="plot-wrapper">
-                    <div class="interactive-plot" id="{channel.lower()}-interactive">
-                        {interactive_plot}
+# Bytes per base64 encode step; a multiple of 3 so chunks concatenate cleanly
+_BASE64_CHUNK = 57 * 1024
+
+# Rows per chunk when streaming oversized waveform CSVs (--max-samples)
+_CAPPED_READ_CHUNK_ROWS = 1 << 16
+
+# Fallback markdown syntax, matched in a single pass (order sets precedence:
+# images before links, bold before italic)
+_NOTES_RE = re.compile(
+    r'(?P<h3>^### (?P<h3_text>.*)$)'
+    r'|(?P<h2>^## (?P<h2_text>.*)$)'
+    r'|(?P<h1>^# (?P<h1_text>.*)$)'
+    r'|(?P<b>\*\*(?P<b_text>.*?)\*\*)'
+    r'|(?P<i>\*(?P<i_text>.*?)\*)'
+    r'|(?P<img>!\[(?P<img_alt>.*?)\]\((?P<img_src>.*?)\))'
+    r'|(?P<a>\[(?P<a_text>.*?)\]\((?P<a_href>.*?)\))',
+    re.MULTILINE
+)
+
+# Notes images uploaded through the GUI are referenced from /temp/ but copied
+# next to the report in images/
+_TEMP_IMG_SRC_RE = re.compile(r'src="/temp/([^"]+)"')
+
+# Measurement table: statistic columns in display order, and the row markup
+_MEASUREMENT_KEYS = ('Current', 'Minimum', 'Maximum', 'Mean', 'Std Dev', 'Count')
+_MEASUREMENT_ROW = """
+                <tr>
+                    <td><strong>{}</strong></td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                    <td>{}</td>
+                </tr>
+            """
+
+# Channel settings tiles: the tile markup and the analog/math channel details
+_CHANNEL_TILE = """
+                <div class="channel-tile">
+                    <div class="channel-banner" style="background-color: {color};">
+                        <h4>{title}</h4>
                     </div>
-                    <div class="static-plot" style="display: none;" id="{channel.lower()}-static">
-                        <img src="data:image/png;base64,{static_plot_b64}" alt="{channel} Waveform" style="max-width: 100%; height: auto;">
-                        <p><em>Static fallback plot - interactive plot failed to load</em></p>
+                    <div class="channel-content">
+                        <p><strong>Label:</strong> {label}</p>{details}
                     </div>
-                    <script>
-                        // Check if Plotly loaded correctly, if not show static plot
-                        function check{channel}Plot() {{
-                            var plotDiv = document.querySelector('#{channel.lower()}-interactive .plotly-graph-div');
-                            if (plotDiv && window.Plotly) {{
-                                console.log('{channel} interactive plot loaded successfully');
-                                return; // Plot loaded successfully
-                            }}
-                            
-                            // Try again after a longer delay
-                            setTimeout(function() {{
-                                var plotDiv2 = document.querySelector('#{channel.lower()}-interactive .plotly-graph-div');
-                                if (!plotDiv2 || !window.Plotly) {{
-                                    console.log('{channel} falling back to static plot');
-                                    document.getElementById('{channel.lower()}-interactive').style.display = 'none';
-                                    document.getElementById('{channel.lower()}-static').style.display = 'block';
-                                }} else {{
-                                    console.log('{channel} interactive plot loaded after delay');
-                                }}
-                            }}, 3000);
-                        }}
-                        
-                        // Initial check after DOM is ready
-                        if (document.readyState === 'loading') {{
-                            document.addEventListener('DOMContentLoaded', function() {{
-                                setTimeout(check{channel}Plot, 1000);
-                            }});
-                        }} else {{
-                            setTimeout(check{channel}Plot, 1000);
-                        }}
-                    </script>
                 </div>
-                '''
-            else:
-                return interactive_plot
-                
-        except Exception as e:
-            print(f"Interactive {channel} plot failed: {e}")
-            # Fall back to static plot only
-            static_plot_b64 = self._create_static_plot(channel, data, y_col, y_label, color, 'lines', channel_label)
-            if static_plot_b64:
-                return f'<img src="data:image/png;base64,{static_plot_b64}" alt="{channel} Waveform" style="max-width: 100%; height: auto;">'
-            else:
-                return f"<p>Failed to create {channel} plot</p>"
-    
-    def _create_static_plot(self, channel, data, y_col, y_label, color, mode, channel_label=None):
-        """Create static plot as fallback."""
-        if channel_label is None:
-            channel_label = channel
-            
-        try:
-            plt.figure(figsize=(12, 4))
-            
-            if 'markers' in mode:
-                plt.plot(data['Time_s'], data[y_col], 
-                        color=color, linewidth=2, marker='o', markersize=4, 
-                        label=f'{channel_label} {y_label.split("(")[0].strip()}')
-            else:
-                plt.plot(data['Time_s'], data[y_col], 
-                        color=color, linewidth=1, 
-                        label=f'{channel_label} {y_label.split("(")[0].strip()}')
-            
-            plt.title(f'{channel_label} Waveform ({len(data)} samples)')
-            plt.xlabel('Time (s)')
-            plt.ylabel(y_label)
-            plt.grid(True, alpha=0.3)
-            plt.legend()
-            plt.tight_layout()
-            
-            # Save to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            buffer.seek(0)
-            plot_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            plt.close()
-            
-            return plot_data
-        except Exception as e:
-            print(f"Failed to create static {channel} plot: {e}")
-            return None
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=self.ch1_data['Time_s'],
-            y=self.ch1_data['Voltage_V'],
-            mode='lines',
-            name='CH1 Voltage',
-            line=dict(color='#1f77b4', width=1)
-        ))
-        
-        fig.update_layout(
-            title=f"CH1 Waveform ({len(self.ch1_data)} samples)",
-            xaxis_title="Time (s)",
-            yaxis_title="Voltage (V)",
-            hovermode='x unified',
-            template='plotly_white',
-            height=400,
-            showlegend=True
-        )
-        
-        return pyo.plot(fig, output_type='div', include_plotlyjs='inline')
-    
-
-    def create_channel_config_html(self):
-        """Create HTML for channel configurations using tile-style callouts."""
-        config = self.measurement_data.get('config', {})
-        channel_configs = []
-        
-        # Define channel colors for tile banners
-        channel_colors = {
-            'CH1': 'yellow',
-            'CH2': 'lime', 
-            'CH3': 'cyan',
-            'CH4': 'magenta',
-            'M1': 'indigo'
-        }
-        
-        # Check for active channels (CH1-CH4)
-        for ch_num in range(1, 5):  # CH1-CH4
-            ch_name = f"ch{ch_num}"
-            if (f'{ch_name}_scale' in config or 
-                f'CH{ch_num}' in self.channel_data or
-                config.get(f'{ch_name}_display', '').strip() == '1'):  # Check if channel is active
-                
-                scale = config.get(f'{ch_name}_scale', 'Unknown')
-                bandwidth = config.get(f'{ch_name}_bandwidth_limit', 'Unknown')
-                coupling = config.get(f'{ch_name}_coupling', 'Unknown')
-                offset = config.get(f'{ch_name}_offset', 'Unknown')
-                display = config.get(f'{ch_name}_display', 'Unknown')
-                
-                # Get custom channel label if available
-                channel_key = f'CH{ch_num}'
-                custom_label = self.channel_metadata.get(channel_key, {}).get('label', '')
-                channel_color = channel_colors.get(channel_key, '#cccccc')
-                
-                channel_configs.append(f'''
-                <div class="channel-tile">
-                    <div class="channel-banner" style="background-color: {channel_color};">
-                        <h4>Channel-{ch_num}</h4>
-                    </div>
-                    <div class="channel-content">
-                        <p><strong>Label:</strong> {custom_label or 'None'}</p>
+                """
+_CHANNEL_TILE_DETAILS = """
                         <p><strong>Voltage Scale:</strong> {scale}</p>
                         <p><strong>Bandwidth Limit:</strong> {bandwidth}</p>
                         <p><strong>Coupling:</strong> {coupling}</p>
-                        <p><strong>Offset:</strong> {offset}</p>
-                    </div>
-                </div>
-                ''')
-        
-        # Check for Math channel
-        if 'M1' in self.channel_data:
-            custom_label = self.channel_metadata.get('M1', {}).get('label', '')
-            channel_color = channel_colors.get('M1', '#cccccc')
-            
-            channel_configs.append(f'''
-            <div class="channel-tile">
-                <div class="channel-banner" style="background-color: {channel_color};">
-                    <h4>Math-1</h4>
-                </div>
-                <div class="channel-content">
-                    <p><strong>Label:</strong> {custom_label or 'None'}</p>
-                    <p><strong>Function:</strong> Math function (details from oscilloscope)</p>
-                </div>
-            </div>
-            ''')
-        
-        # Default to CH1 if no channels found
-        if not channel_configs:
-            scale = config.get('ch1_scale', 'Unknown')
-            bandwidth = config.get('ch1_bandwidth_limit', 'Unknown') 
-            coupling = config.get('ch1_coupling', 'Unknown')
-            offset = config.get('ch1_offset', 'Unknown')
-            
-            # Get custom CH1 label if available
-            custom_label = self.channel_metadata.get('CH1', {}).get('label', '')
-            channel_color = channel_colors.get('CH1', '#cccccc')
-            
-            channel_configs.append(f'''
-            <div class="channel-tile">
-                <div class="channel-banner" style="background-color: {channel_color};">
-                    <h4>Channel-1</h4>
-                </div>
-                <div class="channel-content">
-                    <p><strong>Label:</strong> {custom_label or 'None'}</p>
-                    <p><strong>Voltage Scale:</strong> {scale}</p>
-                    <p><strong>Bandwidth Limit:</strong> {bandwidth}</p>
-                    <p><strong>Coupling:</strong> {coupling}</p>
-                    <p><strong>Offset:</strong> {offset}</p>
-                </div>
-            </div>
-            ''')
-        
-        return '<div class="channel-tiles-container">' + ''.join(channel_configs) + '</div>'
-    
-    def create_all_plots_html(self):
-        """Create HTML for all available channel plots."""
-        plots_html = []
-        
-        # Generate plots for all available channels
-        for channel in sorted(self.channel_data.keys()):
-            plot_html = self.create_channel_plot(channel)
-            plots_html.append(f'''
-            <div class="plot-section">
-                <h3>{channel} Waveform</h3>
-                {plot_html}
-            </div>
-            ''')
-        
-        return ''.join(plots_html)
-    
-    def create_csv_data_section(self):
-        """Create HTML section with embedded CSV data for download."""
-        if not self.csv_data_b64:
-            return ""
-            
-        csv_section = """
-        <div class="csv-data-section">
-            <h3>Raw Data Files</h3>
-            <p>The following CSV data files are embedded in this report and can be downloaded:</p>
-            <div class="csv-downloads">
-        """
-        
-        for channel, csv_b64 in self.csv_data_b64.items():
-            # Create filename based on channel
-            filename = f"{channel.lower()}_waveform_data.csv"
-            csv_section += f"""
-                <div class="csv-download-item">
-                    <h4>{channel} Waveform Data</h4>
-                    <p>Contains {len(self.channel_data[channel])} data points</p>
-                    <a href="data:text/csv;base64,{csv_b64}" 
-                       download="{filename}" 
-                       class="download-btn">
-                        📊 Download {channel} CSV Data
-                    </a>
-                </div>
-            """
-        
-        csv_section += """
-            </div>
-        </div>
-        """
-        
-        return csv_section
-
-    def create_notes_section_html(self):
-        """Create HTML section for measurement notes."""
-        if not self.measurement_notes_html or self.measurement_notes_html.strip() == "":
-            return ""  # Don't show notes section if no notes exist
-        
-        # Fix image paths to use the copied images in the images/ directory
-        # This converts /temp/filename.png to ./images/filename.png for the report
-        import re
-        fixed_notes_html = re.sub(
-            r'src="/temp/([^"]+)"',
-            r'src="./images/\1"',
-            self.measurement_notes_html
-        )
-        
-        notes_section = f"""
-        <div class="notes-section">
-            <h3>📝 Measurement Notes</h3>
-            <div class="notes-content">
-                {fixed_notes_html}
-            </div>
-        </div>
-        """
-        
-        return notes_section
+                        <p><strong>Offset:</strong> {offset}</p>"""
+_MATH_TILE_DETAILS = """
+                        <p><strong>Function:</strong> Math function (details from oscilloscope)</p>"""
 
-    def generate_html_report(self, output_file: str = "measurement_report.html"):
-        """Generate the static HTML report."""
-        
-        # Get directory name for title
-        directory_name = self.input_dir.name
-        
-        html_template = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Oscilloscope Measurement Report</title>
-    <style>
-        body {{
+# Report stylesheet; identical for every report, so it is kept out of the
+# template and either inlined as-is or written once as report.css
+_REPORT_CSS = """
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background-color: white;
             padding: 30px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             border-bottom: 3px solid #1f77b4;
             padding-bottom: 20px;
             margin-bottom: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #1f77b4;
             margin: 0;
             font-size: 2.5em;
-        }}
-        .header h2 {{
+        }
+        .header h2 {
             color: #666;
             margin: 5px 0 0 0;
             font-weight: normal;
-        }}
-        .info-section {{
+        }
+        .info-section {
             background-color: #f8f9fa;
             padding: 15px;
             border-radius: 5px;
             margin-bottom: 30px;
-        }}
-        .info-section h3 {{
+        }
+        .info-section h3 {
             margin-top: 0;
             color: #495057;
-        }}
-        .measurements-table {{
+        }
+        .measurements-table {
             width: 100%;
             border-collapse: collapse;
             margin-bottom: 30px;
-        }}
+        }
         .measurements-table th,
-        .measurements-table td {{
+        .measurements-table td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid #ddd;
-        }}
-        .measurements-table th {{
+        }
+        .measurements-table th {
             background-color: #1f77b4;
             color: white;
             font-weight: bold;
-        }}
-        .measurements-table tr:hover {{
+        }
+        .measurements-table tr:hover {
             background-color: #f5f5f5;
-        }}
-        .screenshot-section {{
+        }
+        .screenshot-section {
             text-align: center;
             margin: 30px 0;
-        }}
-        .screenshot-section img {{
+        }
+        .screenshot-section img {
             max-width: 100%;
             height: auto;
             border: 2px solid #ddd;
             border-radius: 5px;
-        }}
-        .plots-section {{
+        }
+        .plots-section {
             margin-top: 30px;
-        }}
-        .plot-container {{
+        }
+        .plot-container {
             margin-bottom: 30px;
             border: 1px solid #ddd;
             border-radius: 5px;
             overflow: hidden;
-        }}
-        .plot-title {{
+        }
+        .plot-title {
             background-color: #1f77b4;
             color: white;
             padding: 10px 15px;
             margin: 0;
             font-size: 1.2em;
-        }}
-        .plot-content {{
+        }
+        .plot-content {
             padding: 10px;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             margin-top: 50px;
             padding-top: 20px;
             border-top: 1px solid #ddd;
             color: #666;
-        }}
-        .csv-data-section {{
+        }
+        .csv-data-section {
             background-color: #f8f9fa;
             padding: 20px;
             border-radius: 5px;
             margin: 30px 0;
-        }}
-        .csv-downloads {{
+        }
+        .csv-downloads {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 20px;
-        }}
-        .channel-tiles-container {{
+        }
+        .channel-tiles-container {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 20px;
             margin: 20px 0;
-        }}
-        .channel-tile {{
+        }
+        .channel-tile {
             border: 1px solid #ddd;
             border-radius: 8px;
             overflow: hidden;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             background-color: white;
-        }}
-        .channel-banner {{
+        }
+        .channel-banner {
             padding: 15px;
             color: black;
             font-weight: bold;
             text-align: center;
             border-bottom: 1px solid #ddd;
-        }}
-        .channel-banner h4 {{
+        }
+        .channel-banner h4 {
             margin: 0;
             font-size: 1.1em;
             color: black;
             text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
-        }}
-        .channel-content {{
+        }
+        .channel-content {
             padding: 15px;
-        }}
-        .channel-content p {{
+        }
+        .channel-content p {
             margin: 8px 0;
             font-size: 0.9em;
-        }}
-        .channel-content strong {{
+        }
+        .channel-content strong {
             color: #495057;
             margin-top: 15px;
-        }}
-        .csv-download-item {{
+        }
+        .csv-download-item {
             background-color: white;
             padding: 15px;
             border-radius: 5px;
             border: 1px solid #ddd;
-        }}
-        .csv-download-item h4 {{
+        }
+        .csv-download-item h4 {
             margin-top: 0;
             color: #495057;
-        }}
-        .download-btn {{
+        }
+        .download-btn {
             display: inline-block;
             background-color: #28a745;
             color: white;
@@ -903,58 +403,83 @@ class StaticMeasurementReportGenerator:
             border-radius: 5px;
             margin-top: 10px;
             transition: background-color 0.3s;
-        }}
-        .download-btn:hover {{
+        }
+        .download-btn:hover {
             background-color: #218838;
-        }}
-        .notes-section {{
+        }
+        .notes-section {
             background-color: #f8f9fa;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 30px;
             border-left: 4px solid #1f77b4;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .notes-section h3 {{
+        }
+        .notes-section h3 {
             margin-top: 0;
             color: #1f77b4;
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
-        .notes-content {{
+        }
+        .notes-content {
             margin-top: 15px;
             line-height: 1.6;
-        }}
-        .notes-content img {{
+        }
+        .notes-content img {
             max-width: 100%;
             height: auto;
             border-radius: 4px;
             margin: 10px 0;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .notes-content h1, .notes-content h2, .notes-content h3 {{
+        }
+        .notes-content h1, .notes-content h2, .notes-content h3 {
             color: #495057;
             margin-top: 20px;
             margin-bottom: 10px;
-        }}
-        .notes-content p {{
+        }
+        .notes-content p {
             margin-bottom: 12px;
-        }}
-        .notes-content code {{
+        }
+        .notes-content code {
             background-color: #e9ecef;
             padding: 2px 4px;
             border-radius: 3px;
             font-family: 'Courier New', monospace;
-        }}
-        .notes-content pre {{
+        }
+        .notes-content pre {
             background-color: #e9ecef;
             padding: 10px;
             border-radius: 4px;
             overflow-x: auto;
             font-family: 'Courier New', monospace;
-        }}
-    </style>
+        }
+"""
+_REPORT_CSS_FILE = "report.css"
+
+# First line of every report: identifies the inputs and options it was built
+# from, so the up-to-date check doesn't skip a rebuild for different ones
+_REPORT_SIGNATURE_LINE = "<!-- report-signature: {} -->\n"
+
+# Generator options that change the report contents (and so its signature)
+_SIGNATURE_OPTIONS = ('max_samples', 'external_screenshot', 'external_css', 'link_csv',
+                      'gzip_csv', 'plotly_js', 'static_fallback')
+
+# Shared Plotly bundle written next to reports with --plotly-js file; versioned so
+# reports from a newer plotly.py never load an older bundle
+_PLOTLY_JS_FILE = "plotly-{}.min.js"
+_SOURCE_MAP_RE = re.compile(r'^//# sourceMappingURL=.*$', re.MULTILINE)
+
+# Report page template (str.format syntax). It is parsed once at import into
+# literal/field pairs so a report can be written out piece by piece
+_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Oscilloscope Measurement Report</title>
+    {stylesheet}{plotly_script}
 </head>
 <body>
     <div class="container">
@@ -963,101 +488,989 @@ class StaticMeasurementReportGenerator:
             <h2>Measurement Report</h2>
         </div>
         
-        {notes_section}
+        {notes_section}
+        
+        <div class="info-section">
+            <h3>Test Information</h3>
+            <p><strong>Instrument:</strong> Keysight MSOX4154A Oscilloscope</p>
+            <p><strong>Timestamp:</strong> {timestamp}</p>
+            <p><strong>Statistics Mode:</strong> {statistics_mode}</p>
+            <p><strong>Input Directory:</strong> {input_dir}</p>
+            <p><strong>Raw Response:</strong> <code>{raw_response}</code></p>
+        </div>
+        
+        <div class="info-section">
+            <h3>Oscilloscope Configuration</h3>
+            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px;">
+                <div>
+                    <h4>Acquisition Settings</h4>
+                    <p><strong>Acquisition Mode:</strong> {acquisition_mode}</p>
+                    <p><strong>Time Scale:</strong> {time_scale}</p>
+                </div>
+                {channel_configs}
+            </div>
+        </div>
+        
+        <h3>Measurement Results</h3>
+        <table class="measurements-table">
+            <thead>
+                <tr>
+                    <th>Measurement</th>
+                    <th>Current</th>
+                    <th>Minimum</th>
+                    <th>Maximum</th>
+                    <th>Mean</th>
+                    <th>Std Dev</th>
+                    <th>Count</th>
+                </tr>
+            </thead>
+            <tbody>
+                {measurements_rows}
+            </tbody>
+        </table>
+        
+        {screenshot_section}
+        
+        <div class="plots-section">
+            <h3>Interactive Waveform Plots</h3>
+            
+            {all_plots}
+        </div>
+        
+        {csv_data_section}
+        
+        <div class="footer">
+            <p>Generated by Lab Data Logging Framework - Redlen Technologies</p>
+            <p>Report created on {generation_time}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+_REPORT_TEMPLATE_PARTS = tuple(
+    (literal, field) for literal, field, _, _ in string.Formatter().parse(_REPORT_TEMPLATE)
+)
+
+
+def _read_waveform_csv(csv_file, **kwargs):
+    """Read a two-column waveform CSV (time, value) as float32 with the C parser.
+    
+    csv_file is a path (memory-mapped) or an in-memory buffer.
+    """
+    return pd.read_csv(csv_file, usecols=[0, 1], dtype=np.float32, engine='c',
+                       memory_map=isinstance(csv_file, Path), **kwargs)
+
+
+def _parse_results(content: str) -> Dict[str, Any]:
+    """Parse the text of a results_*.txt file into the measurement_data dict."""
+    measurement_data = {
+        'timestamp': '',
+        'statistics_mode': '',
+        'raw_response': '',
+        'measurements': [],
+        'config': {}
+    }
+    config = measurement_data['config']
+    
+    current_measurement = None
+    
+    for match in _RESULTS_RE.finditer(content):
+        value = match.group('value').strip()
+        field = match.group('field')
+        
+        if field in _RESULTS_FIELDS:
+            measurement_data[_RESULTS_FIELDS[field]] = value
+        elif field is not None:
+            # Acquisition or channel configuration, e.g. "CH1 Bandwidth Limit: 0"
+            config[_RESULTS_CONFIG_KEYS[field]] = value
+        elif match.group('measurement') is not None:
+            # New measurement
+            if current_measurement:
+                measurement_data['measurements'].append(current_measurement)
+            current_measurement = {'name': value, 'values': {}}
+        elif current_measurement:
+            current_measurement['values'][match.group('stat')] = value
+    
+    # Add the last measurement
+    if current_measurement:
+        measurement_data['measurements'].append(current_measurement)
+    
+    return measurement_data
+
+
+def _downsample_minmax(t, y, n_bins: int = _PLOT_MAX_BINS):
+    """Reduce a trace to the min and max sample of each bin, preserving its envelope.
+    
+    Returns (t, y) unchanged if the trace is already short enough.
+    """
+    t = np.asarray(t)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_bins:
+        return t, y
+    
+    bin_size = n // n_bins
+    n_full = n // bin_size
+    bins = y[:n_full * bin_size].reshape(n_full, bin_size)
+    offsets = np.arange(n_full) * bin_size
+    indices = [bins.argmin(axis=1) + offsets, bins.argmax(axis=1) + offsets]
+    
+    # Samples left over after the last full bin
+    if n_full * bin_size < n:
+        tail = y[n_full * bin_size:]
+        indices.append(np.array([tail.argmin(), tail.argmax()]) + n_full * bin_size)
+    
+    keep = np.unique(np.concatenate(indices))  # sorted, so time order is kept
+    return t[keep], y[keep]
+
+
+def _rasterize_waveform(t, y, color: str, title: str, markers: bool = False,
+                        width: int = 1800, height: int = 600) -> bytes:
+    """Draw a waveform straight to a PNG with Pillow and return the PNG bytes.
+    
+    The trace is reduced to its min/max envelope per pixel column first, so
+    drawing cost does not depend on the capture length. Raises ImportError
+    if Pillow is not installed.
+    """
+    from PIL import Image, ImageDraw
+    
+    left, top, right, bottom = 90, 50, width - 30, height - 50
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([left, top, right, bottom], outline='#999999')
+    draw.text((left, top - 30), title, fill='black')
+    
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(y):
+        t_min, t_max = t.min(), t.max()
+        y_min, y_max = y.min(), y.max()
+        # Map to pixel coordinates (image rows grow downwards)
+        xs = left + (t - t_min) / ((t_max - t_min) or 1.0) * (right - left)
+        ys = bottom - (y - y_min) / ((y_max - y_min) or 1.0) * (bottom - top)
+        xs, ys = _downsample_minmax(xs, ys, n_bins=right - left)
+        points = list(zip(xs.tolist(), ys.tolist()))
+        
+        if len(points) > 1:
+            draw.line(points, fill=color, width=2)
+        if markers or len(points) == 1:
+            for x, y_px in points:
+                draw.ellipse([x - 3, y_px - 3, x + 3, y_px + 3], fill=color)
+        
+        # Axis extents in place of tick labels
+        draw.text((5, top), f"{y_max:.4g}", fill='black')
+        draw.text((5, bottom - 10), f"{y_min:.4g}", fill='black')
+        draw.text((left, bottom + 10), f"{t_min:.4g} s", fill='black')
+        draw.text((right - 80, bottom + 10), f"{t_max:.4g} s", fill='black')
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class _Base64Payload:
+    """Binary content (bytes or a file path) to be base64-encoded straight into the report.
+    
+    With gzip=True the content is gzip-compressed on the way in; the report
+    decodes it in the browser with DecompressionStream.
+    """
+    
+    def __init__(self, source, gzip: bool = False):
+        self.source = source
+        self.gzip = gzip
+    
+    def _iter_chunks(self):
+        """Yield the raw content in _BASE64_CHUNK-sized pieces."""
+        if isinstance(self.source, Path):
+            with open(self.source, 'rb') as src:
+                while True:
+                    chunk = src.read(_BASE64_CHUNK)
+                    if not chunk:
+                        break
+                    yield chunk
+        else:
+            data = memoryview(self.source)
+            for start in range(0, len(data), _BASE64_CHUNK):
+                yield data[start:start + _BASE64_CHUNK]
+    
+    def _iter_gzip_chunks(self):
+        """Yield the gzip-compressed content in pieces whose length is a multiple of 3."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+        pending = b''
+        for chunk in self._iter_chunks():
+            pending += compressor.compress(chunk)
+            if len(pending) >= _BASE64_CHUNK:
+                cut = len(pending) - len(pending) % 3
+                yield pending[:cut]
+                pending = pending[cut:]
+        yield pending + compressor.flush()
+    
+    def write_to(self, f):
+        """Encode in fixed-size chunks so the full base64 string never exists in memory."""
+        # Every chunk but the last is a multiple of 3 bytes, so the encoded
+        # pieces concatenate without inner padding
+        chunks = self._iter_gzip_chunks() if self.gzip else self._iter_chunks()
+        for chunk in chunks:
+            f.write(_b64encode(chunk).decode('ascii'))
+
+
+def _write_report_template(f, values: Dict[str, Any]):
+    """Stream the precompiled report template to an open file.
+    
+    A field value may be a string or an iterable of pieces (list, tuple or
+    generator), which are written in order as they are produced, without
+    being joined first. Pieces are strings or _Base64Payload objects, which
+    are encoded directly into the file.
+    """
+    for literal, field in _REPORT_TEMPLATE_PARTS:
+        f.write(literal)
+        if field is None:
+            continue
+        value = values[field]
+        if isinstance(value, str):
+            f.write(value)
+        else:
+            for chunk in value:
+                if isinstance(chunk, _Base64Payload):
+                    chunk.write_to(f)
+                else:
+                    f.write(chunk)
+
+
+class StaticMeasurementReportGenerator:
+    """Generates static HTML reports from oscilloscope measurement data."""
+    
+    def __init__(self, input_dir: str, max_samples: Optional[int] = None,
+                 external_screenshot: bool = False, external_css: bool = False, link_csv: bool = False,
+                 gzip_csv: bool = False, verbose: bool = False,
+                 plotly_js: str = 'inline', static_fallback: bool = False, plot_workers: int = 1):
+        self.input_dir = Path(input_dir)
+        self.max_samples = max_samples  # Decimate waveforms while loading to bound memory
+        self.external_screenshot = external_screenshot  # Reference the PNG next to the report instead of embedding it
+        self.link_csv = link_csv  # Link the CSVs next to the report instead of embedding them
+        self.gzip_csv = gzip_csv  # Embed the CSVs gzip-compressed, decompressed by the browser on download
+        self.verbose = verbose  # Print per-channel data ranges while plotting
+        self.external_css = external_css  # Link a shared report.css instead of inlining the stylesheet
+        self.plotly_js = plotly_js  # 'inline': bundle embedded once, 'file': shared plotly-<version>.min.js, 'cdn': cdn.plot.ly
+        self._plotly_emitted = False  # Inline bundle already written with an earlier plot
+        self.static_fallback = static_fallback  # Also render a static PNG behind each interactive plot
+        self.plot_workers = plot_workers  # Processes used to build channel plots (1: build them in-process)
+        
+        # Data storage
+        self.measurement_data = {}
+        self.channel_data = {}  # Will store data for all channels (CH1-CH4, M1)
+        self.channel_metadata = {}  # Will store channel labels and settings
+        self.channel_labels = {channel: '' for channel in CHANNEL_COLORS}  # Custom labels resolved from metadata
+        self.screenshot_path = None
+        self.screenshot_data = None  # Image bytes to embed (possibly re-encoded)
+        self.screenshot_mime = 'image/png'
+        self.measurement_notes_html = ""
+        self.csv_files = {}  # CSV files embedded (base64) in the report for download
+        self.csv_payloads = {}  # CSV files mapped while loading, reused for embedding
+        
+    def load_channel_metadata(self):
+        """Load channel metadata (labels, colors) if available."""
+        metadata_file = self.input_dir / "channel_metadata.json"
+        if metadata_file.exists():
+            try:
+                metadata = _json_loads(metadata_file.read_bytes())
+                self.channel_metadata = metadata.get("channels", {})
+                print(f"Loaded channel metadata: {self.channel_metadata}")
+            except Exception as e:
+                print(f"Warning: Could not load channel metadata: {e}")
+                self.channel_metadata = {}
+        else:
+            print("No channel metadata file found, using defaults")
+            self.channel_metadata = {}
+        
+        # Resolve custom labels once instead of on every plot/tile
+        self.channel_labels = {
+            channel: self.channel_metadata.get(channel, {}).get('label', '')
+            for channel in CHANNEL_COLORS
+        }
+
+    def report_signature(self) -> str:
+        """Digest of the resolved input directory, the content options and this script."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.input_dir.resolve()).encode('utf-8'))
+        digest.update(repr([(name, getattr(self, name)) for name in _SIGNATURE_OPTIONS]).encode('utf-8'))
+        digest.update(Path(__file__).read_bytes())
+        return digest.hexdigest()
+
+    def is_report_up_to_date(self, output_file) -> bool:
+        """Check whether output_file was built from these inputs and options and is newer than
+        every input file (and this script)."""
+        output_path = Path(output_file)
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                first_line = f.readline()
+        except (OSError, UnicodeDecodeError):
+            return False
+        if first_line != _REPORT_SIGNATURE_LINE.format(self.report_signature()):
+            return False
+        
+        output_mtime = output_path.stat().st_mtime
+        latest_input = Path(__file__).stat().st_mtime
+        for entry in self.input_dir.iterdir():
+            if entry.name != output_path.name:
+                latest_input = max(latest_input, entry.stat().st_mtime)
+        return output_mtime > latest_input
+    
+    def load_data(self):
+        """Load all measurement data from input directory."""
+        print(f"Loading data from: {self.input_dir}")
+        
+        # Load channel metadata first
+        self.load_channel_metadata()
+        
+        # Scan the directory once and match every file pattern against the listing
+        file_names = [entry.name for entry in os.scandir(self.input_dir) if entry.is_file()]
+        
+        def find_files(pattern):
+            return [self.input_dir / name for name in fnmatch.filter(file_names, pattern)]
+        
+        # Find files - support both old and new filename patterns
+        txt_files = find_files("results_*.txt") or find_files("measurement_results_*.txt")
+        screenshot_files = find_files("screenshot_*.png") or find_files("measurement_results_screenshot_*.png")
+        
+        if not txt_files:
+            raise FileNotFoundError("No measurement results txt file found (tried both 'results_*.txt' and 'measurement_results_*.txt' patterns)")
+        
+        # Load measurement results
+        self.load_measurement_results(txt_files[0])
+        
+        # Load waveform data dynamically for all channels
+        for channel, pattern in _CHANNEL_FILE_PATTERNS.items():
+            channel_files = find_files(pattern)
+            if channel_files:
+                print(f"Loading {channel} data from: {channel_files[0]}")
+                if self.max_samples:
+                    self.channel_data[channel] = self._load_waveform_capped(channel_files[0], self.max_samples)
+                elif self.link_csv:
+                    self.channel_data[channel] = _read_waveform_csv(channel_files[0])
+                else:
+                    # The file is embedded as well: map it once and let both the
+                    # parser and the base64 payload read the same page-cache pages
+                    mapped = self._map_file(channel_files[0])
+                    self.channel_data[channel] = _read_waveform_csv(mapped)
+                    self.csv_payloads[channel] = mapped
+                print(f"  {channel}: {len(self.channel_data[channel])} samples")
+                
+                # Remember the CSV file; it is base64-encoded into the report when written
+                self.csv_files[channel] = channel_files[0]
+        
+        # Load screenshot
+        if screenshot_files:
+            print(f"Loading screenshot: {screenshot_files[0]}")
+            self.load_screenshot(screenshot_files[0])
+        
+        # Load measurement notes
+        self.measurement_notes_html = self.load_measurement_notes()
+    
+    @staticmethod
+    def _map_file(path: Path):
+        """Return a read-only memory map of a file (an empty buffer for empty files)."""
+        with open(path, 'rb') as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return io.BytesIO()  # mmap cannot map zero bytes
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _load_waveform_capped(self, csv_file: Path, max_samples: int):
+        """Stream a waveform CSV in chunks, keeping every k-th row to stay under max_samples."""
+        # Estimate the row count from the average line length of the file head
+        file_size = csv_file.stat().st_size
+        with open(csv_file, 'rb') as f:
+            head = f.read(1 << 16)
+        bytes_per_row = len(head) / max(1, head.count(b'\n'))
+        estimated_rows = int(file_size / bytes_per_row) if bytes_per_row else 0
+        step = max(1, -(-estimated_rows // max_samples))
+        
+        kept = []
+        rows_seen = 0
+        for chunk in _read_waveform_csv(csv_file, chunksize=_CAPPED_READ_CHUNK_ROWS):
+            # Keep rows whose global index is a multiple of step
+            kept.append(chunk.iloc[(-rows_seen) % step::step])
+            rows_seen += len(chunk)
+        
+        data = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+        
+        # The estimate can undershoot; decimate the remainder if needed
+        if len(data) > max_samples:
+            data = data.iloc[::-(-len(data) // max_samples)].reset_index(drop=True)
+        
+        if len(data) < rows_seen:
+            print(f"  Decimated {rows_seen} samples to {len(data)} (--max-samples {max_samples})")
+        return data
+    
+    def load_measurement_results(self, txt_file: Path):
+        """Parse measurement results from txt file."""
+        with open(txt_file, 'r') as f:
+            self.measurement_data = _parse_results(f.read())
+    
+    def load_screenshot(self, screenshot_file: Path):
+        """Load screenshot, re-encode it compactly if Pillow is available, and encode as base64."""
+        self.screenshot_path = screenshot_file
+        if self.external_screenshot:
+            return  # Copied next to the report in generate_html_report, no encoding needed
+        
+        with open(screenshot_file, 'rb') as f:
+            screenshot_data = f.read()
+        self.screenshot_mime = 'image/png'
+        
+        try:
+            from PIL import Image
+        except ImportError:
+            Image = None
+        
+        if Image is not None:
+            try:
+                # Candidates: lossless WebP and a losslessly re-compressed PNG (the
+                # screenshot is a measurement record with small text, so no lossy
+                # encoding); the smallest one (including the original) is embedded
+                candidates = []
+                with Image.open(screenshot_file) as img:
+                    for fmt, mime, save_args in (('WEBP', 'image/webp', dict(lossless=True, quality=100, method=6)),
+                                                 ('PNG', 'image/png', dict(optimize=True))):
+                        buffer = io.BytesIO()
+                        img.save(buffer, format=fmt, **save_args)
+                        candidates.append((buffer.tell(), fmt, mime, buffer))
+                size, fmt, mime, buffer = min(candidates, key=lambda c: c[0])
+                if size < len(screenshot_data):
+                    print(f"  Screenshot re-encoded as {fmt}: {len(screenshot_data)} -> {size} bytes")
+                    screenshot_data = buffer.getvalue()
+                    self.screenshot_mime = mime
+            except Exception as e:
+                print(f"Warning: Could not re-encode screenshot, embedding original: {e}")
+        
+        self.screenshot_data = screenshot_data
+    
+    @staticmethod
+    def _place_file_next_to(source: Path, output_path: Path):
+        """Make an input file available beside the report and return its relative name."""
+        target = output_path.parent / source.name
+        if not target.exists() or not target.samefile(source):
+            shutil.copyfile(source, target)
+        return source.name
+    
+    def _stylesheet_html(self, output_path: Path):
+        """Return the <style>/<link> markup for the report stylesheet."""
+        if not self.external_css:
+            return f"<style>{_REPORT_CSS}    </style>"
+        
+        # Reports written to the same directory share one stylesheet
+        css_path = output_path.parent / _REPORT_CSS_FILE
+        if not css_path.exists() or css_path.read_text(encoding='utf-8') != _REPORT_CSS:
+            css_path.write_text(_REPORT_CSS, encoding='utf-8')
+        return f'<link rel="stylesheet" href="{_REPORT_CSS_FILE}">'
+    
+    def _plotly_script_html(self, output_path: Path):
+        """Return the page-level Plotly <script> tag, if plots don't embed the bundle themselves."""
+        if self.plotly_js == 'cdn':
+            import plotly.offline
+            version = plotly.offline.get_plotlyjs_version()
+            return f'\n    <script src="https://cdn.plot.ly/plotly-{version}.min.js" charset="utf-8"></script>'
+        if self.plotly_js != 'file':
+            return ""
+        
+        # Reports written to the same directory share one copy of the bundle
+        import plotly.offline
+        js_name = _PLOTLY_JS_FILE.format(plotly.offline.get_plotlyjs_version())
+        js_path = output_path.parent / js_name
+        if not js_path.exists():
+            plotly_js = _SOURCE_MAP_RE.sub('', plotly.offline.get_plotlyjs())
+            js_path.write_text(plotly_js, encoding='utf-8')
+            print(f"Wrote shared Plotly bundle: {js_path}")
+        return f'\n    <script src="{js_name}"></script>'
+    
+    def _convert_image_to_base64(self, image_path):
+        """Convert an image file to a base64 data URI."""
+        try:
+            # Handle relative paths by making them relative to input directory
+            if not Path(image_path).is_absolute():
+                full_path = self.input_dir / image_path
+            else:
+                full_path = Path(image_path)
+            
+            if full_path.exists() and full_path.is_file():
+                # Determine MIME type based on file extension
+                ext = full_path.suffix.lower()
+                mime_types = {
+                    '.png': 'image/png',
+                    '.jpg': 'image/jpeg',
+                    '.jpeg': 'image/jpeg',
+                    '.gif': 'image/gif',
+                    '.bmp': 'image/bmp',
+                    '.webp': 'image/webp',
+                    '.svg': 'image/svg+xml'
+                }
+                mime_type = mime_types.get(ext, 'image/png')
+                
+                # Read and encode the image
+                with open(full_path, 'rb') as f:
+                    image_data = f.read()
+                b64_data = _b64encode(image_data).decode('utf-8')
+                
+                print(f"Embedded image: {image_path} ({len(image_data)} bytes)")
+                return f"data:{mime_type};base64,{b64_data}"
+            else:
+                print(f"Warning: Image file not found: {image_path}")
+                return image_path  # Return original path as fallback
+        except Exception as e:
+            print(f"Error converting image {image_path} to base64: {e}")
+            return image_path  # Return original path as fallback
+    
+    def _embed_images_in_html(self, html_content):
+        """Replace image src attributes with base64 data URIs in HTML."""
+        
+        def replace_img_src(match):
+            full_tag = match.group(0)
+            src = match.group(1)
+            
+            # Skip if already a data URI
+            if src.startswith('data:'):
+                return full_tag
+                
+            # Convert to base64 data URI
+            data_uri = self._convert_image_to_base64(src)
+            
+            # Replace the src attribute value in the full tag
+            return full_tag.replace(f'src="{src}"', f'src="{data_uri}"').replace(f"src='{src}'", f'src="{data_uri}"')
+        
+        # Find all img tags and replace their src attributes
+        pattern = r'<img[^>]*src=["\']([^"\']+)["\'][^>]*>'
+        return re.sub(pattern, replace_img_src, html_content)
+
+    def load_measurement_notes(self):
+        """Load measurement notes from markdown file and convert to HTML."""
+        notes_file = self.input_dir / "measurement_notes.md"
+        notes_html = ""
+        
+        if notes_file.exists():
+            try:
+                with open(notes_file, 'r', encoding='utf-8') as f:
+                    notes_content = f.read().strip()
+                
+                if notes_content:
+                    try:
+                        import markdown
+                    except ImportError:
+                        markdown = None
+                    
+                    if markdown is not None:
+                        # Convert markdown to HTML
+                        md = markdown.Markdown(extensions=['extra', 'codehilite'])
+                        notes_html = md.convert(notes_content)
+                    else:
+                        # Fallback: simple HTML conversion
+                        notes_html = self._simple_markdown_to_html(notes_content)
+                        
+                    # Embed images as base64 data URIs for standalone HTML
+                    notes_html = self._embed_images_in_html(notes_html)
+                        
+                    print(f"Loaded measurement notes: {len(notes_content)} characters")
+                else:
+                    print("Measurement notes file is empty")
+            except Exception as e:
+                print(f"Error loading measurement notes: {e}")
+                notes_html = ""
+        else:
+            print("No measurement notes file found")
+            
+        return notes_html
+    
+    def _simple_markdown_to_html(self, text):
+        """Simple markdown to HTML converter for fallback."""
+        
+        def replace_match(match):
+            kind = match.lastgroup
+            if kind in ('h1', 'h2', 'h3'):
+                inner = _NOTES_RE.sub(replace_match, match.group(f'{kind}_text'))
+                return f'<{kind}>{inner}</{kind}>'
+            if kind == 'b':
+                return f'<strong>{_NOTES_RE.sub(replace_match, match.group("b_text"))}</strong>'
+            if kind == 'i':
+                return f'<em>{_NOTES_RE.sub(replace_match, match.group("i_text"))}</em>'
+            if kind == 'img':
+                # Images - convert to base64 data URIs for embedding
+                data_uri = self._convert_image_to_base64(match.group('img_src'))
+                return f'<img src="{data_uri}" alt="{match.group("img_alt")}" style="max-width: 100%; height: auto;">'
+            # Links
+            inner = _NOTES_RE.sub(replace_match, match.group('a_text'))
+            return f'<a href="{match.group("a_href")}">{inner}</a>'
+        
+        # Headers, bold, italic, images and links in one scan
+        text = _NOTES_RE.sub(replace_match, text)
+        
+        # Line breaks and paragraphs
+        paragraphs = text.split('\n\n')
+        paragraphs = [f'<p>{p.replace(chr(10), "<br>")}</p>' for p in paragraphs if p.strip()]
+        text = '\n'.join(paragraphs)
+        
+        return text
+    
+    def create_channel_plot(self, channel):
+        """Create waveform plot for any channel."""
+        if channel not in self.channel_data or self.channel_data[channel] is None:
+            return f"<p>No {channel} data available</p>"
+        
+        data = self.channel_data[channel]
+        print(f"Creating {channel} plot with {len(data)} points")
+        
+        # Column names and colors by channel (other math channels plot like M1)
+        y_col, y_label = _CHANNEL_YCOL.get(channel, _CHANNEL_YCOL['M1'])
+        color = CHANNEL_COLORS.get(channel, 'orange')
+        
+        if self.verbose:
+            # Straight NumPy reductions; only computed when they are printed
+            t = data['Time_s'].to_numpy()
+            y = data[y_col].to_numpy()
+            print(f"Time range: {t.min():.6f} to {t.max():.6f} s")
+            print(f"{y_label} range: {y.min():.6f} to {y.max():.6f}")
+        
+        return self._create_plot_with_fallback(channel, data, y_col, y_label, color)
+    
+    def _create_plot_with_fallback(self, channel, data, y_col, y_label, color):
+        """Create plot with static fallback."""
+        # Get custom channel label if available
+        channel_label = self.channel_labels.get(channel) or channel
+        
+        try:
+            print(f"  Creating interactive {channel} plot...")
+            # Try interactive plot first
+            import plotly.graph_objects as go
+            fig = go.Figure()
+            mode = 'lines+markers' if channel.startswith('M') else 'lines'
+            marker_size = 4 if channel.startswith('M') else 2
+            
+            # Only the envelope of long captures is visible at plot resolution;
+            # float32 halves what Plotly has to encode into the page
+            plot_x, plot_y = _downsample_minmax(
+                data['Time_s'].to_numpy(dtype=np.float32),
+                data[y_col].to_numpy(dtype=np.float32)
+            )
+            if len(plot_y) < len(data):
+                print(f"  Downsampled {channel} plot trace: {len(data)} -> {len(plot_y)} points")
+                mode = 'lines'  # Markers on an envelope would be misleading
+            elif len(plot_y) > _MARKERS_MAX_POINTS:
+                mode = 'lines'
+            # Long captures render through WebGL even when downsampled: the
+            # envelope still holds thousands of points, which SVG pans slowly
+            scatter = go.Scattergl if len(data) > _WEBGL_MIN_POINTS else go.Scatter
+            
+            fig.add_trace(scatter(
+                x=plot_x,
+                y=plot_y,
+                mode=mode,
+                name=f'{channel_label} {y_label.split("(")[0].strip()}',
+                line=dict(color=color, width=2),
+                marker=dict(size=marker_size) if 'markers' in mode else None
+            ))
+            
+            fig.update_layout(
+                title=f"{channel_label} Waveform ({len(data)} samples)",
+                xaxis_title="Time (s)",
+                yaxis_title=y_label,
+                hovermode='x unified',
+                template='plotly_white',
+                height=400,
+                showlegend=True
+            )
+            
+            print(f"  Generating {channel} Plotly HTML...")
+            # Inline mode embeds the bundle with the first plot only; later
+            # plots reuse window.Plotly
+            embed_plotlyjs = self.plotly_js == 'inline' and not self._plotly_emitted
+            interactive_plot = fig.to_html(
+                full_html=False,
+                include_plotlyjs=embed_plotlyjs,
+                include_mathjax=False,
+                config={'responsive': True},
+                div_id=f'{channel.lower()}-plot',
+                validate=False  # Figure is built here, no need to re-validate
+            )
+            self._plotly_emitted = self._plotly_emitted or embed_plotlyjs
+            print(f"  {channel} interactive plot generated successfully")
+            
+            if not self.static_fallback:
+                return interactive_plot
+            
+            # Create static fallback
+            print(f"  Creating {channel} static fallback...")
+            static_plot_b64 = self._create_static_plot(channel, data, y_col, y_label, color, mode, channel_label)
+            
+            if static_plot_b64:
+                return f'''
+                <div class="plot-wrapper">
+                    <div class="interactive-plot" id="{channel.lower()}-interactive">
+                        {interactive_plot}
+                    </div>
+                    <div class="static-plot" style="display: none;" id="{channel.lower()}-static">
+                        <img src="data:image/png;base64,{static_plot_b64}" alt="{channel} Waveform" style="max-width: 100%; height: auto;">
+                        <p><em>Static fallback plot - interactive plot failed to load</em></p>
+                    </div>
+                    <script>
+                        // Check if Plotly loaded correctly, if not show static plot
+                        function check{channel}Plot() {{
+                            var plotDiv = document.querySelector('#{channel.lower()}-interactive .plotly-graph-div');
+                            if (plotDiv && window.Plotly) {{
+                                console.log('{channel} interactive plot loaded successfully');
+                                return; // Plot loaded successfully
+                            }}
+                            
+                            // Try again after a longer delay
+                            setTimeout(function() {{
+                                var plotDiv2 = document.querySelector('#{channel.lower()}-interactive .plotly-graph-div');
+                                if (!plotDiv2 || !window.Plotly) {{
+                                    console.log('{channel} falling back to static plot');
+                                    document.getElementById('{channel.lower()}-interactive').style.display = 'none';
+                                    document.getElementById('{channel.lower()}-static').style.display = 'block';
+                                }} else {{
+                                    console.log('{channel} interactive plot loaded after delay');
+                                }}
+                            }}, 3000);
+                        }}
+                        
+                        // Initial check after DOM is ready
+                        if (document.readyState === 'loading') {{
+                            document.addEventListener('DOMContentLoaded', function() {{
+                                setTimeout(check{channel}Plot, 1000);
+                            }});
+                        }} else {{
+                            setTimeout(check{channel}Plot, 1000);
+                        }}
+                    </script>
+                </div>
+                '''
+            else:
+                return interactive_plot
+                
+        except Exception as e:
+            print(f"Interactive {channel} plot failed: {e}")
+            # Fall back to static plot only
+            static_plot_b64 = self._create_static_plot(channel, data, y_col, y_label, color, 'lines', channel_label)
+            if static_plot_b64:
+                return f'<img src="data:image/png;base64,{static_plot_b64}" alt="{channel} Waveform" style="max-width: 100%; height: auto;">'
+            else:
+                return f"<p>Failed to create {channel} plot</p>"
+    
+    def _create_static_plot(self, channel, data, y_col, y_label, color, mode, channel_label=None):
+        """Create static plot as fallback (rasterized directly with Pillow)."""
+        if channel_label is None:
+            channel_label = channel
+        
+        try:
+            png = _rasterize_waveform(
+                data['Time_s'].to_numpy(), data[y_col].to_numpy(), color,
+                f'{channel_label} Waveform ({len(data)} samples) - {y_label} vs Time (s)',
+                markers='markers' in mode
+            )
+            return _b64encode(png).decode('utf-8')
+        except Exception as e:
+            print(f"Failed to create static {channel} plot: {e}")
+            return None
+    
+    def create_channel_config_html(self):
+        """Create HTML for channel configurations using tile-style callouts."""
+        config = self.measurement_data.get('config', {})
+        channel_configs = []
         
-        <div class="info-section">
-            <h3>Test Information</h3>
-            <p><strong>Instrument:</strong> Keysight MSOX4154A Oscilloscope</p>
-            <p><strong>Timestamp:</strong> {timestamp}</p>
-            <p><strong>Statistics Mode:</strong> {statistics_mode}</p>
-            <p><strong>Input Directory:</strong> {input_dir}</p>
-            <p><strong>Raw Response:</strong> <code>{raw_response}</code></p>
-        </div>
+        # Check for active channels (CH1-CH4)
+        for ch_num in range(1, 5):  # CH1-CH4
+            ch_name = f"ch{ch_num}"
+            if (f'{ch_name}_scale' in config or 
+                f'CH{ch_num}' in self.channel_data or
+                config.get(f'{ch_name}_display', '').strip() == '1'):  # Check if channel is active
+                channel_configs.append(self._channel_tile_html(config, ch_num))
         
-        <div class="info-section">
-            <h3>Oscilloscope Configuration</h3>
-            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px;">
-                <div>
-                    <h4>Acquisition Settings</h4>
-                    <p><strong>Acquisition Mode:</strong> {acquisition_mode}</p>
-                    <p><strong>Time Scale:</strong> {time_scale}</p>
-                </div>
-                {channel_configs}
-            </div>
-        </div>
+        # Check for Math channel
+        if 'M1' in self.channel_data:
+            channel_configs.append(_CHANNEL_TILE.format(
+                color=CHANNEL_COLORS.get('M1', '#cccccc'),
+                title='Math-1',
+                label=self.channel_labels.get('M1', '') or 'None',
+                details=_MATH_TILE_DETAILS
+            ))
         
-        <h3>Measurement Results</h3>
-        <table class="measurements-table">
-            <thead>
-                <tr>
-                    <th>Measurement</th>
-                    <th>Current</th>
-                    <th>Minimum</th>
-                    <th>Maximum</th>
-                    <th>Mean</th>
-                    <th>Std Dev</th>
-                    <th>Count</th>
-                </tr>
-            </thead>
-            <tbody>
-                {measurements_rows}
-            </tbody>
-        </table>
+        # Default to CH1 if no channels found
+        if not channel_configs:
+            channel_configs.append(self._channel_tile_html(config, 1))
         
-        {screenshot_section}
+        return ['<div class="channel-tiles-container">', *channel_configs, '</div>']
+    
+    def _channel_tile_html(self, config, ch_num):
+        """Format the settings tile of analog channel ch_num."""
+        ch_name = f"ch{ch_num}"
+        channel_key = f'CH{ch_num}'
+        return _CHANNEL_TILE.format(
+            color=CHANNEL_COLORS.get(channel_key, '#cccccc'),
+            title=f'Channel-{ch_num}',
+            label=self.channel_labels.get(channel_key, '') or 'None',
+            details=_CHANNEL_TILE_DETAILS.format(
+                scale=config.get(f'{ch_name}_scale', 'Unknown'),
+                bandwidth=config.get(f'{ch_name}_bandwidth_limit', 'Unknown'),
+                coupling=config.get(f'{ch_name}_coupling', 'Unknown'),
+                offset=config.get(f'{ch_name}_offset', 'Unknown')
+            )
+        )
+    
+    def create_all_plots_html(self):
+        """Create HTML pieces for all available channel plots."""
+        plots_html = []
+        self._plotly_emitted = False
+        channels = sorted(self.channel_data.keys())
+        
+        if self.plot_workers > 1 and len(channels) > 1:
+            # Channels are independent and CPU-bound; the first one carries the
+            # inline Plotly bundle, as it would when built in order
+            tasks = [self._plot_task(channel, plotly_emitted=i > 0) for i, channel in enumerate(channels)]
+            with ProcessPoolExecutor(max_workers=min(self.plot_workers, len(channels))) as executor:
+                channel_plots = list(executor.map(_create_channel_plot_worker, tasks, channels))
+            self._plotly_emitted = True
+        else:
+            channel_plots = [self.create_channel_plot(channel) for channel in channels]
         
-        <div class="plots-section">
-            <h3>Interactive Waveform Plots</h3>
+        # Each plot div is kept as its own piece (it can carry the Plotly
+        # bundle) instead of joined
+        for channel, plot_html in zip(channels, channel_plots):
+            plots_html.append(f'''
+            <div class="plot-section">
+                <h3>{channel} Waveform</h3>
+                ''')
+            plots_html.append(plot_html)
+            plots_html.append('''
+            </div>
+            ''')
+        
+        return plots_html
+    
+    def _plot_task(self, channel, plotly_emitted):
+        """Return a copy of this generator holding only what plotting `channel` needs, for a worker process."""
+        task = copy.copy(self)
+        task.channel_data = {channel: self.channel_data[channel]}
+        task.measurement_data = {}
+        task.screenshot_data = None
+        task.measurement_notes_html = ""
+        task.csv_files = {}
+        task.csv_payloads = {}
+        task._plotly_emitted = plotly_emitted
+        return task
+    
+    def create_csv_data_section(self, output_path: Optional[Path] = None):
+        """Create HTML section with embedded (or, with link_csv, linked) CSV data for download."""
+        if not self.csv_files:
+            return ""
+        link_csv = self.link_csv and output_path is not None
+        gzip_csv = self.gzip_csv and not link_csv
             
-            {all_plots}
+        csv_section = f"""
+        <div class="csv-data-section">
+            <h3>Raw Data Files</h3>
+            <p>The following CSV data files are {'stored next to' if link_csv else 'embedded in'} this report and can be downloaded:</p>
+            <div class="csv-downloads">
+        """
+        
+        # Pieces for the streaming writer; CSV contents are encoded while writing
+        csv_section = [csv_section]
+        if gzip_csv:
+            csv_section.append(_GZIP_CSV_DOWNLOAD_JS)
+        for channel, csv_file in self.csv_files.items():
+            # Create filename based on channel
+            filename = f"{channel.lower()}_waveform_data.csv"
+            if gzip_csv:
+                filename += ".gz"  # What browsers without DecompressionStream save
+            csv_section.append(f"""
+                <div class="csv-download-item">
+                    <h4>{channel} Waveform Data</h4>
+                    <p>Contains {len(self.channel_data[channel])} data points</p>
+                    <a href=\"""")
+            if link_csv:
+                csv_section.append(self._place_file_next_to(csv_file, output_path))
+            elif gzip_csv:
+                csv_section.append("data:application/gzip;base64,")
+                csv_section.append(_Base64Payload(self.csv_payloads.get(channel, csv_file), gzip=True))
+            else:
+                csv_section.append("data:text/csv;base64,")
+                csv_section.append(_Base64Payload(self.csv_payloads.get(channel, csv_file)))
+            csv_section.append(f"""" 
+                       download="{filename}" 
+                       class="download-btn"{' onclick="return downloadGzipCsv(this)"' if gzip_csv else ''}>
+                        📊 Download {channel} CSV Data
+                    </a>
+                </div>
+            """)
+        
+        csv_section.append("""
+            </div>
         </div>
+        """)
         
-        {csv_data_section}
+        return csv_section
+
+    def create_notes_section_html(self):
+        """Create HTML section for measurement notes."""
+        if not self.measurement_notes_html or self.measurement_notes_html.strip() == "":
+            return ""  # Don't show notes section if no notes exist
         
-        <div class="footer">
-            <p>Generated by Lab Data Logging Framework - Redlen Technologies</p>
-            <p>Report created on {generation_time}</p>
+        # Fix image paths to use the copied images in the images/ directory
+        # This converts /temp/filename.png to ./images/filename.png for the report
+        fixed_notes_html = _TEMP_IMG_SRC_RE.sub(r'src="./images/\1"', self.measurement_notes_html)
+        
+        notes_section = f"""
+        <div class="notes-section">
+            <h3>📝 Measurement Notes</h3>
+            <div class="notes-content">
+                {fixed_notes_html}
+            </div>
         </div>
-    </div>
-</body>
-</html>
         """
         
-        # Generate measurements table rows
-        measurements_rows = ""
+        return notes_section
+
+    def _iter_measurement_rows(self):
+        """Yield the measurement table rows, formatted as the writer reaches them."""
         for measurement in self.measurement_data['measurements']:
-            name = measurement['name']
-            values = measurement['values']
-            measurements_rows += f"""
-                <tr>
-                    <td><strong>{name}</strong></td>
-                    <td>{values.get('Current', 'N/A')}</td>
-                    <td>{values.get('Minimum', 'N/A')}</td>
-                    <td>{values.get('Maximum', 'N/A')}</td>
-                    <td>{values.get('Mean', 'N/A')}</td>
-                    <td>{values.get('Std Dev', 'N/A')}</td>
-                    <td>{values.get('Count', 'N/A')}</td>
-                </tr>
-            """
+            yield _MEASUREMENT_ROW.format(
+                measurement['name'],
+                *[measurement['values'].get(key, 'N/A') for key in _MEASUREMENT_KEYS]
+            )
+    
+    def generate_html_report(self, output_file: str = "measurement_report.html"):
+        """Generate the static HTML report."""
+        
+        # Get directory name for title
+        directory_name = self.input_dir.name
+        
+        output_path = Path(output_file)
         
         # Generate screenshot section
+        # (kept as pieces so the base64 payload is written without being copied)
         screenshot_section = ""
-        if self.screenshot_b64:
+        if self.external_screenshot and self.screenshot_path:
+            screenshot_name = self._place_file_next_to(self.screenshot_path, output_path)
             screenshot_section = f"""
         <div class="screenshot-section">
             <h3>Oscilloscope Screenshot</h3>
-            <img src="data:image/png;base64,{self.screenshot_b64}" alt="Oscilloscope Screenshot">
+            <img src="{screenshot_name}" alt="Oscilloscope Screenshot" loading="lazy" decoding="async">
         </div>
             """
+        elif self.screenshot_data:
+            screenshot_section = (f"""
+        <div class="screenshot-section">
+            <h3>Oscilloscope Screenshot</h3>
+            <img src="data:{self.screenshot_mime};base64,""", _Base64Payload(self.screenshot_data), """" alt="Oscilloscope Screenshot" loading="lazy" decoding="async">
+        </div>
+            """)
         
         # Generate dynamic content
         channel_configs_html = self.create_channel_config_html()
         all_plots_html = self.create_all_plots_html()
-        csv_data_section_html = self.create_csv_data_section()
+        csv_data_section_html = self.create_csv_data_section(output_path)
         notes_section_html = self.create_notes_section_html()
         
-        # Fill template
-        html_content = html_template.format(
+        # Template field values
+        template_values = dict(
+            stylesheet=self._stylesheet_html(output_path),
+            plotly_script=self._plotly_script_html(output_path),
             directory_name=directory_name,
             timestamp=self.measurement_data.get('timestamp', 'Unknown'),
             statistics_mode=self.measurement_data.get('statistics_mode', 'Unknown'),
@@ -1066,7 +1479,7 @@ class StaticMeasurementReportGenerator:
             acquisition_mode=self.measurement_data.get('config', {}).get('acquisition_mode', 'Unknown'),
             time_scale=self.measurement_data.get('config', {}).get('time_scale', 'Unknown'),
             channel_configs=channel_configs_html,
-            measurements_rows=measurements_rows,
+            measurements_rows=self._iter_measurement_rows(),
             screenshot_section=screenshot_section,
             all_plots=all_plots_html,
             csv_data_section=csv_data_section_html,
@@ -1074,16 +1487,71 @@ class StaticMeasurementReportGenerator:
             generation_time=time.strftime('%Y-%m-%d %H:%M:%S')
         )
         
-        # Write HTML file
-        output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Fill template straight into the HTML file
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(_REPORT_SIGNATURE_LINE.format(self.report_signature()))
+            _write_report_template(f, template_values)
+        
+        # Release the CSV mappings; later reports encode from the files instead
+        for mapped in self.csv_payloads.values():
+            mapped.close()
+        self.csv_payloads.clear()
         
         print(f"Static HTML report generated: {output_path.absolute()}")
         return output_path
 
-def main():
-    """Main execution function."""
+
+def _create_channel_plot_worker(generator: StaticMeasurementReportGenerator, channel: str) -> str:
+    """Build one channel's plot HTML (plot worker process)."""
+    return generator.create_channel_plot(channel)
+
+
+def _generate_report_for_directory(input_dir: Path, output_name: str, options: Dict[str, Any],
+                                   force: bool = False) -> Path:
+    """Load one capture directory and write its report inside it (batch worker)."""
+    generator = StaticMeasurementReportGenerator(input_dir, **options)
+    if not force and generator.is_report_up_to_date(input_dir / output_name):
+        print(f"Report up to date, skipping: {input_dir / output_name}")
+        return input_dir / output_name
+    generator.load_data()
+    return generator.generate_html_report(input_dir / output_name)
+
+
+def generate_reports_batch(parent_dir: str, output_name: str, options: Dict[str, Any],
+                           max_workers: Optional[int] = None, force: bool = False) -> int:
+    """Generate a report in every capture subdirectory of parent_dir in parallel.
+    
+    Each report is independent, so directories are processed in separate
+    processes. Returns the number of directories that failed.
+    """
+    capture_dirs = sorted(
+        d for d in Path(parent_dir).iterdir()
+        if d.is_dir() and (any(d.glob("results_*.txt")) or any(d.glob("measurement_results_*.txt")))
+    )
+    if not capture_dirs:
+        print(f"No capture directories with results files found in {parent_dir}")
+        return 0
+    
+    print(f"Generating {len(capture_dirs)} reports...")
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_generate_report_for_directory, d, output_name, options, force): d
+            for d in capture_dirs
+        }
+        for future in as_completed(futures):
+            try:
+                print(f"Report done: {future.result()}")
+            except Exception as e:
+                failures += 1
+                print(f"Error generating report for {futures[future]}: {e}")
+    
+    print(f"\nBatch complete: {len(capture_dirs) - failures} succeeded, {failures} failed")
+    return failures
+
+
+def main(argv=None):
+    """Main execution function. argv defaults to sys.argv[1:]; returns the exit code."""
     
     parser = argparse.ArgumentParser(
         description="Generate static HTML report from oscilloscope measurement data",
@@ -1092,6 +1560,7 @@ def main():
 Examples:
   python generate_static_report.py ./captures/Board_00003/VDD_1V45_L/
   python generate_static_report.py ./captures/Board_00003/VDD_1V45_L/ --output custom_report.html
+  python generate_static_report.py ./captures/Board_00003/ --batch
         """
     )
     
@@ -1112,20 +1581,124 @@ Examples:
         help="Don't automatically open browser"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--external-screenshot",
+        action="store_true",
+        help="Reference the screenshot PNG next to the report instead of embedding it as base64 "
+             "(smaller HTML, but the report is no longer self-contained)"
+    )
+    
+    parser.add_argument(
+        "--external-css",
+        action="store_true",
+        help="Write the stylesheet once as report.css next to the report and link it instead of inlining it"
+    )
+    
+    parser.add_argument(
+        "--link-csv",
+        action="store_true",
+        help="Link the waveform CSVs next to the report instead of embedding them as base64 "
+             "(smaller HTML, but the report is no longer self-contained)"
+    )
+    
+    parser.add_argument(
+        "--gzip-csv",
+        action="store_true",
+        help="Embed the waveform CSVs gzip-compressed; the browser decompresses them on download "
+             "(much smaller HTML; browsers without DecompressionStream save a .csv.gz instead)"
+    )
+    
+    parser.add_argument(
+        "--plotly-js",
+        choices=["inline", "file", "cdn"],
+        default="inline",
+        help="How to include plotly.js: 'inline' embeds it once in the report (default), "
+             "'file' writes one shared plotly-<version>.min.js next to the report(s) and references it, "
+             "'cdn' loads it from cdn.plot.ly (needs network access when viewing)"
+    )
+    
+    parser.add_argument(
+        "--static-fallback",
+        action="store_true",
+        help="Also embed a static PNG of each plot, shown if plotly.js fails to load "
+             "(useful with --plotly-js cdn/file; slower and larger)"
+    )
+    
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Print the time and value range of each channel while plotting"
+    )
+    
+    parser.add_argument(
+        "--max-samples",
+        type=int,
+        default=None,
+        help="Decimate each waveform to at most this many samples while loading (bounds memory for very large captures)"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the report even if it was built from the same inputs and options "
+             "and is newer than all input files"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat input_dir as a parent directory and generate a report inside each capture subdirectory, in parallel"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --batch (default: CPU count)"
+    )
+    
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=1,
+        help="Build channel plots in this many parallel processes (default: 1, in-process)"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    options = dict(
+        max_samples=args.max_samples,
+        external_screenshot=args.external_screenshot,
+        external_css=args.external_css,
+        link_csv=args.link_csv,
+        gzip_csv=args.gzip_csv,
+        verbose=args.verbose,
+        plotly_js=args.plotly_js,
+        static_fallback=args.static_fallback,
+        plot_workers=args.plot_workers
+    )
     
     try:
         print("Keysight MSOX4154A - Static HTML Report Generator")
         print("=" * 55)
         
-        # Create report generator
-        generator = StaticMeasurementReportGenerator(args.input_dir)
+        if args.batch:
+            failures = generate_reports_batch(args.input_dir, Path(args.output).name, options,
+                                              args.workers, args.force)
+            return 1 if failures else 0
         
-        # Load data
-        generator.load_data()
+        # Create report generator
+        generator = StaticMeasurementReportGenerator(args.input_dir, **options)
         
-        # Generate HTML report
-        report_path = generator.generate_html_report(args.output)
+        if not args.force and generator.is_report_up_to_date(args.output):
+            report_path = Path(args.output)
+            print("Report is up to date with its inputs, skipping generation (use --force to rebuild)")
+        else:
+            # Load data
+            generator.load_data()
+            
+            # Generate HTML report
+            report_path = generator.generate_html_report(args.output)
         
         print("\nReport generation completed successfully!")
         print(f"HTML Report: {report_path}")
@@ -24,15 +24,12 @@ Date: 2025-10
 import sys
 import os
 import argparse
+import functools
 import json
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-import subprocess
 import logging
-import asyncio
-import traceback
 
 # Configure logging
 logging.basicConfig(
@@ -44,17 +41,104 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Ensure the virtual environment is activated
-venv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".venv")
-if os.name == "nt":
-    venv_python = os.path.join(venv_path, "Scripts", "python.exe")
-else:
-    venv_python = os.path.join(venv_path, "bin", "python3")
+# Fast JSON encoding for logged configurations (optional)
+try:
+    import orjson
+    
+    def format_config(config: Dict[str, Any]) -> str:
+        """Format a configuration as indented JSON for the log."""
+        try:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(config, indent=2, default=str)
+except ImportError:
+    def format_config(config: Dict[str, Any]) -> str:
+        """Format a configuration as indented JSON for the log."""
+        return json.dumps(config, indent=2, default=str)
+
+@functools.lru_cache(maxsize=1)
+def python_exe() -> str:
+    """Return the interpreter for child scripts: the project's .venv if it exists, else this one."""
+    venv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".venv")
+    if os.name == "nt":
+        venv_python = os.path.join(venv_path, "Scripts", "python.exe")
+    else:
+        venv_python = os.path.join(venv_path, "bin", "python3")
+    
+    if os.path.exists(venv_python):
+        return venv_python
+    return sys.executable
+
+# yaml, asyncio, shlex, traceback and the report generator are imported where they are used,
+# so that commands like --help and list-results do not pay for them
+
+def import_yaml():
+    """Return PyYAML and its libyaml-backed safe loader/dumper, if it was built with it."""
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml, loader, dumper
+
+# Parsed configurations kept in the cache; the least recently used are removed
+CONFIG_CACHE_ENTRIES = 32
+
+def config_cache_dir() -> Path:
+    """Return the per-user directory holding parsed YAML configurations."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    return (Path(base) if base else Path.home() / ".cache") / "lab_cli"
+
+def load_yaml_cached(yaml_file: Path) -> Any:
+    """Load a YAML file, reusing the cached parse of a file with identical content."""
+    import hashlib
+    
+    with open(yaml_file, 'r') as f:
+        text = f.read()
+    
+    # Keyed by content, so edits invalidate the entry and copies of a file share it
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    cache_file = config_cache_dir() / f"{digest}.json"
+    
+    try:
+        with open(cache_file, 'r') as f:
+            data = json.load(f)
+        os.utime(cache_file)  # mark as recently used
+        return data
+    except (OSError, ValueError):
+        pass
+    
+    yaml, loader, _ = import_yaml()
+    data = yaml.load(text, Loader=loader)
+    
+    # Only cache documents that survive a JSON round trip unchanged (no dates, non-string keys, ...)
+    try:
+        if json.loads(json.dumps(data)) == data:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, cache_file)
+            prune_config_cache(cache_file.parent)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write cache {cache_file}: {e}")
+    
+    return data
 
-if os.path.exists(venv_python):
-    PYTHON_EXE = venv_python
-else:
-    PYTHON_EXE = sys.executable
+def prune_config_cache(cache_dir: Path, keep: int = CONFIG_CACHE_ENTRIES):
+    """Remove all but the `keep` most recently used entries of the config cache."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 def load_defaults():
     """Load default configuration from defaults.yml file."""
@@ -85,23 +169,27 @@ def load_defaults():
         "preview_output_path": True
     }
     
-    if defaults_file.exists():
-        try:
-            with open(defaults_file, 'r') as f:
-                loaded_defaults = yaml.safe_load(f) or {}
-                defaults.update(loaded_defaults)
-        except Exception as e:
-            logger.error(f"Error loading defaults.yml: {e}")
-    else:
+    # Opening the file in load_yaml_cached doubles as the existence check
+    try:
+        loaded_defaults = load_yaml_cached(defaults_file) or {}
+        defaults.update(loaded_defaults)
+    except FileNotFoundError:
         logger.info("defaults.yml not found, using built-in defaults")
+    except Exception as e:
+        logger.error(f"Error loading defaults.yml: {e}")
     
     return defaults
 
+def enabled_keys(flags: Dict[str, bool]) -> List[str]:
+    """Return the names of the enabled entries of a channels/capture_types mapping."""
+    return [name for name, enabled in flags.items() if enabled]
+
 def save_config_to_file(config: Dict[str, Any], filepath: str) -> bool:
     """Save configuration to a YAML file."""
     try:
+        yaml, _, dumper = import_yaml()
         with open(filepath, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, indent=2)
+            yaml.dump(config, f, Dumper=dumper, default_flow_style=False, indent=2)
         logger.info(f"Configuration saved to {filepath}")
         return True
     except Exception as e:
@@ -111,24 +199,24 @@ def save_config_to_file(config: Dict[str, Any], filepath: str) -> bool:
 def load_config_from_file(filepath: str) -> Optional[Dict[str, Any]]:
     """Load configuration from a YAML file."""
     try:
-        with open(filepath, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_cached(Path(filepath))
         logger.info(f"Configuration loaded from {filepath}")
         return config
     except Exception as e:
         logger.error(f"Error loading configuration from {filepath}: {e}")
         return None
 
-def build_output_dir(destination: str, board_number: str, label: str, auto_timestamp: bool, timestamp_format: str) -> str:
-    """Build the output directory path."""
-    output_dir = destination
-    
+# Timestamp format setting -> strftime format; anything else falls back to YYYYMMDD_HHMMSS
+TIMESTAMP_FORMATS = {
+    "YYYYMMDD.HHMMSS": "%Y%m%d.%H%M%S",
+    "YYYYMMDD_HHMMSS": "%Y%m%d_%H%M%S",
+}
+
+def build_output_dir(destination: str, board_number: str, label: str, auto_timestamp: bool, timestamp_format: str,
+                     now: Optional[datetime] = None) -> str:
+    """Build the output directory path. Pass now to give several directories the same timestamp."""
     if auto_timestamp:
-        now = datetime.now()
-        if timestamp_format == "YYYYMMDD.HHMMSS":
-            timestamp = now.strftime("%Y%m%d.%H%M%S")
-        else:  # YYYYMMDD_HHMMSS
-            timestamp = now.strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime(TIMESTAMP_FORMATS.get(timestamp_format, "%Y%m%d_%H%M%S"))
         
         # Build directory name: Board_Label_Timestamp
         dir_name = f"{board_number}_{label}_{timestamp}"
@@ -139,22 +227,43 @@ def build_output_dir(destination: str, board_number: str, label: str, auto_times
     output_dir = os.path.join(destination, dir_name)
     return output_dir
 
-async def run_measurement_capture(config: Dict[str, Any]) -> Dict[str, Any]:
-    """Run the measurement capture process."""
+# Longest single output line accepted from the capture subprocess
+SUBPROCESS_LINE_LIMIT = 1 << 20
+
+async def log_stream_lines(stream, log, lines: List[str]):
+    """Log each line of a subprocess stream as it arrives, collecting the decoded lines."""
+    async for line in stream:
+        text = line.decode('utf-8', errors='replace')
+        log(text.rstrip())
+        lines.append(text)
+
+async def run_measurement_capture(config: Dict[str, Any],
+                                  active_channels: Optional[List[str]] = None,
+                                  capture_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the measurement capture process.
+    
+    active_channels/capture_types are the enabled entries of the config's
+    channels/capture_types; they are worked out from the config when not given.
+    """
+    import asyncio
+    
     logger.info("=== MEASUREMENT CAPTURE STARTED ===")
-    logger.info(f"Config: {json.dumps(config, indent=2)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Config: %s", format_config(config))
     
     try:
         # Get active channels
-        active_channels = [ch for ch, enabled in config.get("channels", {}).items() if enabled]
-        capture_types = [ct for ct, enabled in config.get("capture_types", {}).items() if enabled]
+        if active_channels is None:
+            active_channels = enabled_keys(config.get("channels", {}))
+        if capture_types is None:
+            capture_types = enabled_keys(config.get("capture_types", {}))
         
         logger.info(f"Active channels: {active_channels}")
         logger.info(f"Capture types: {capture_types}")
         
         # Build command
         cmd = [
-            PYTHON_EXE, "test_measurement_results.py",
+            python_exe(), "test_measurement_results.py",
             config["visa_address"],
             "--output-dir", config["output_dir"]
         ]
@@ -169,7 +278,9 @@ async def run_measurement_capture(config: Dict[str, Any]) -> Dict[str, Any]:
         if "waveforms" not in capture_types:
             cmd.append("--no-waveforms")
         
-        logger.info(f"Command to execute: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.INFO):
+            import shlex
+            logger.info("Command to execute: %s", shlex.join(cmd))
         
         # Run the measurement script
         logger.info("Creating subprocess...")
@@ -177,27 +288,30 @@ async def run_measurement_capture(config: Dict[str, Any]) -> Dict[str, Any]:
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            cwd=os.getcwd()
+            cwd=os.getcwd(),
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},  # so output arrives line by line
+            limit=SUBPROCESS_LINE_LIMIT
         )
         
         logger.info(f"Subprocess created with PID: {process.pid}")
         
-        # Wait for process completion
+        # Import the report generator (numpy, pandas, ...) while the capture runs
+        if "html_report" in capture_types:
+            report_preload = asyncio.get_running_loop().run_in_executor(None, preload_report_generator)
+        
+        # Log the output as it arrives while waiting for process completion
         logger.info("Waiting for process to complete...")
-        stdout, stderr = await process.communicate()
+        stdout_lines, stderr_lines = [], []
+        await asyncio.gather(
+            log_stream_lines(process.stdout, logger.info, stdout_lines),
+            log_stream_lines(process.stderr, logger.error, stderr_lines)
+        )
+        await process.wait()
         
         logger.info(f"Process completed with return code: {process.returncode}")
         
-        # Log output
-        stdout_text = stdout.decode('utf-8', errors='replace')
-        stderr_text = stderr.decode('utf-8', errors='replace')
-        
-        logger.info("=== SUBPROCESS STDOUT ===")
-        logger.info(stdout_text)
-        
-        if stderr_text:
-            logger.error("=== SUBPROCESS STDERR ===")
-            logger.error(stderr_text)
+        stdout_text = ''.join(stdout_lines)
+        stderr_text = ''.join(stderr_lines)
         
         if process.returncode == 0:
             logger.info("Measurement capture completed successfully")
@@ -205,38 +319,33 @@ async def run_measurement_capture(config: Dict[str, Any]) -> Dict[str, Any]:
             # Generate HTML report if requested
             if "html_report" in capture_types:
                 logger.info("Generating HTML report...")
+                await report_preload
                 
-                report_cmd = [
-                    PYTHON_EXE, "generate_static_report.py",
+                report_args = [
                     config["output_dir"],
                     "--output", os.path.join(config["output_dir"], "measurement_report.html")
                 ]
                 
-                logger.info(f"Report command: {' '.join(report_cmd)}")
+                if logger.isEnabledFor(logging.INFO):
+                    import shlex
+                    logger.info("Report arguments: %s", shlex.join(report_args))
                 
-                report_process = await asyncio.create_subprocess_exec(
-                    *report_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=os.getcwd()
-                )
-                
-                report_stdout, report_stderr = await report_process.communicate()
-                
-                report_stdout_text = report_stdout.decode('utf-8', errors='replace')
-                report_stderr_text = report_stderr.decode('utf-8', errors='replace')
+                # Generated in-process instead of starting another interpreter. It runs on
+                # this thread: run_report_generator swaps the process-wide sys.stdout/stderr,
+                # which must not happen from a worker thread while other threads print
+                report_result = run_report_generator(report_args)
                 
                 logger.info("=== REPORT GENERATION STDOUT ===")
-                logger.info(report_stdout_text)
+                logger.info(report_result["stdout"])
                 
-                if report_stderr_text:
+                if report_result["stderr"]:
                     logger.error("=== REPORT GENERATION STDERR ===")
-                    logger.error(report_stderr_text)
+                    logger.error(report_result["stderr"])
                 
-                if report_process.returncode == 0:
+                if report_result["returncode"] == 0:
                     logger.info("HTML report generated successfully")
                 else:
-                    logger.error(f"HTML report generation failed with return code: {report_process.returncode}")
+                    logger.error(f"HTML report generation failed with return code: {report_result['returncode']}")
             
             return {
                 "success": True,
@@ -257,61 +366,112 @@ async def run_measurement_capture(config: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         error_msg = f"Unexpected error in run_measurement_capture: {str(e)}"
         logger.error(error_msg)
+        import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
         return {"success": False, "error": error_msg}
 
+# File types listed for each result directory, in display order
+RESULT_FILE_TYPES = ('.txt', '.png', '.csv', '.html')
+
+def preload_report_generator():
+    """Import generate_static_report ahead of time; import errors are reported by run_report_generator."""
+    import importlib
+    
+    try:
+        importlib.import_module("generate_static_report")
+    except Exception:
+        pass
+
+def run_report_generator(argv: List[str]) -> Dict[str, Any]:
+    """Run generate_static_report in this process, capturing its output like a subprocess would.
+    
+    The output is captured by redirecting sys.stdout/sys.stderr, which affects every thread,
+    so call it from the main (event loop) thread rather than an executor.
+    """
+    import contextlib
+    import io
+    
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            import generate_static_report
+            returncode = generate_static_report.main(argv)
+        except SystemExit as e:
+            # argparse errors and --help exit instead of returning
+            returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            returncode = 1
+    
+    return {
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue()
+    }
+
 def list_results(results_dir: str = "captures") -> List[Dict[str, Any]]:
     """List all available test results."""
     results_dir = Path(results_dir)
-    results = []
+    results = []  # (ctime, result_info)
     
     if not results_dir.exists():
         logger.warning(f"Results directory {results_dir} does not exist")
-        return results
+        return []
     
     # Look for directories with timestamp patterns
-    for item in results_dir.iterdir():
-        if item.is_dir():
-            result_info = {
-                "name": item.name,
-                "path": str(item),
-                "created": datetime.fromtimestamp(item.stat().st_ctime).isoformat(),
-                "files": []
-            }
-            
-            # Look for common files
-            for pattern in ["*.txt", "*.png", "*.csv", "*.html"]:
-                files = list(item.glob(pattern))
-                result_info["files"].extend([f.name for f in files])
-            
-            results.append(result_info)
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                ctime = entry.stat().st_ctime
+                result_info = {
+                    "name": entry.name,
+                    "path": entry.path,
+                    "created": datetime.fromtimestamp(ctime).isoformat(),
+                    "files": []
+                }
+                
+                # Look for common files, grouped by type in RESULT_FILE_TYPES order
+                files_by_type = {ext: [] for ext in RESULT_FILE_TYPES}
+                with os.scandir(entry.path) as files:
+                    for f in files:
+                        ext = os.path.splitext(f.name)[1].lower()
+                        if ext in files_by_type and f.is_file():
+                            files_by_type[ext].append(f.name)
+                for names in files_by_type.values():
+                    result_info["files"].extend(names)
+                
+                results.append((ctime, result_info))
     
-    # Sort by creation time, newest first
-    results.sort(key=lambda x: x["created"], reverse=True)
-    return results
+    # Sort by creation time, newest first; the raw timestamp also orders correctly
+    # when isoformat() omits the microseconds
+    results.sort(key=lambda x: x[0], reverse=True)
+    return [result_info for _, result_info in results]
+
+# Configuration schema used by validate_config
+REQUIRED_FIELDS = ("visa_address", "destination", "board_number", "label")
+VALID_CHANNELS = frozenset({"CH1", "CH2", "CH3", "CH4", "M1"})
+VALID_CAPTURE_TYPES = frozenset({"measurements", "waveforms", "screenshot", "config", "html_report"})
 
 def validate_config(config: Dict[str, Any]) -> List[str]:
     """Validate configuration and return list of issues."""
     issues = []
     
     # Required fields
-    required_fields = ["visa_address", "destination", "board_number", "label"]
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in config:
             issues.append(f"Missing required field: {field}")
     
     # Channels validation
     if "channels" in config:
-        valid_channels = {"CH1", "CH2", "CH3", "CH4", "M1"}
         for channel in config["channels"]:
-            if channel not in valid_channels:
+            if channel not in VALID_CHANNELS:
                 issues.append(f"Invalid channel: {channel}")
     
     # Capture types validation
     if "capture_types" in config:
-        valid_capture_types = {"measurements", "waveforms", "screenshot", "config", "html_report"}
         for capture_type in config["capture_types"]:
-            if capture_type not in valid_capture_types:
+            if capture_type not in VALID_CAPTURE_TYPES:
                 issues.append(f"Invalid capture type: {capture_type}")
     
     # Check if at least one channel is enabled
@@ -391,13 +551,17 @@ async def cmd_run_test(args):
         config["timestamp_format"]
     )
     
+    # Resolve the enabled channels and capture types once for the rest of the run
+    active_channels = enabled_keys(config["channels"])
+    capture_types = enabled_keys(config["capture_types"])
+    
     print(f"Configuration:")
     print(f"  VISA Address: {config['visa_address']}")
     print(f"  Output Directory: {config['output_dir']}")
     print(f"  Board Number: {config['board_number']}")
     print(f"  Label: {config['label']}")
-    print(f"  Active Channels: {[ch for ch, enabled in config['channels'].items() if enabled]}")
-    print(f"  Capture Types: {[ct for ct, enabled in config['capture_types'].items() if enabled]}")
+    print(f"  Active Channels: {active_channels}")
+    print(f"  Capture Types: {capture_types}")
     print()
     
     # Save configuration if requested
@@ -409,7 +573,7 @@ async def cmd_run_test(args):
     
     # Run the test
     print("Starting measurement capture...")
-    result = await run_measurement_capture(config)
+    result = await run_measurement_capture(config, active_channels, capture_types)
     
     if result["success"]:
         print("SUCCESS: Measurement capture completed successfully!")
@@ -462,34 +626,34 @@ def cmd_generate_report(args):
     print(f"Output File: {args.output}")
     print()
     
-    # Build command
-    cmd = [
-        PYTHON_EXE, "generate_static_report.py",
+    # Build report generator arguments
+    report_args = [
         str(input_dir),
         "--output", str(args.output)
     ]
     
-    print(f"Running: {' '.join(cmd)}")
+    import shlex
+    print(f"Running: generate_static_report.py {shlex.join(report_args)}")
     print()
     
     # Run the report generation
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+        result = run_report_generator(report_args)
         
         print("=== REPORT GENERATION OUTPUT ===")
-        print(result.stdout)
+        print(result["stdout"])
         
-        if result.stderr:
+        if result["stderr"]:
             print("=== REPORT GENERATION ERRORS ===")
-            print(result.stderr)
+            print(result["stderr"])
         
-        if result.returncode == 0:
+        if result["returncode"] == 0:
             print("SUCCESS: HTML report generated successfully!")
             print(f"Report saved to: {args.output}")
             return 0
         else:
             print("ERROR: HTML report generation failed!")
-            print(f"Return code: {result.returncode}")
+            print(f"Return code: {result['returncode']}")
             return 1
             
     except Exception as e:
@@ -523,8 +687,8 @@ def cmd_validate_config(args):
         print(f"  Destination: {config.get('destination', 'Not set')}")
         print(f"  Board Number: {config.get('board_number', 'Not set')}")
         print(f"  Label: {config.get('label', 'Not set')}")
-        print(f"  Active Channels: {[ch for ch, enabled in config.get('channels', {}).items() if enabled]}")
-        print(f"  Capture Types: {[ct for ct, enabled in config.get('capture_types', {}).items() if enabled]}")
+        print(f"  Active Channels: {enabled_keys(config.get('channels', {}))}")
+        print(f"  Capture Types: {enabled_keys(config.get('capture_types', {}))}")
         return 0
     else:
         print("X Configuration validation failed:")
@@ -532,6 +696,48 @@ def cmd_validate_config(args):
             print(f"  - {issue}")
         return 1
 
+def add_run_test_parser(subparsers):
+    """Add the run-test command parser."""
+    run_parser = subparsers.add_parser('run-test', help='Run a measurement test')
+    run_parser.add_argument('--config', help='Configuration file to load (YAML format)')
+    run_parser.add_argument('--visa-address', help='VISA address of the oscilloscope')
+    run_parser.add_argument('--destination', help='Base destination directory for results')
+    run_parser.add_argument('--board-number', help='Board number for naming')
+    run_parser.add_argument('--label', help='Test label for naming')
+    run_parser.add_argument('--channels', nargs='+', choices=['CH1', 'CH2', 'CH3', 'CH4', 'M1'], 
+                          help='Channels to capture (space-separated)')
+    run_parser.add_argument('--capture-types', nargs='+', 
+                          choices=['measurements', 'waveforms', 'screenshot', 'config', 'html_report'],
+                          help='Types of data to capture (space-separated)')
+    run_parser.add_argument('--no-timestamp', action='store_true', help='Disable automatic timestamping')
+    run_parser.add_argument('--timestamp-format', choices=['YYYYMMDD.HHMMSS', 'YYYYMMDD_HHMMSS'], 
+                          help='Timestamp format')
+    run_parser.add_argument('--save-config', help='Save final configuration to file')
+
+def add_list_results_parser(subparsers):
+    """Add the list-results command parser."""
+    list_parser = subparsers.add_parser('list-results', help='List available test results')
+    list_parser.add_argument('--results-dir', default='captures', help='Directory to search for results')
+
+def add_generate_report_parser(subparsers):
+    """Add the generate-report command parser."""
+    report_parser = subparsers.add_parser('generate-report', help='Generate HTML report from test data')
+    report_parser.add_argument('input_dir', help='Directory containing test data')
+    report_parser.add_argument('--output', help='Output HTML file path')
+
+def add_validate_config_parser(subparsers):
+    """Add the validate-config command parser."""
+    validate_parser = subparsers.add_parser('validate-config', help='Validate a configuration file')
+    validate_parser.add_argument('config', help='Configuration file to validate')
+
+# Command name -> function adding its parser, in the order shown by --help
+COMMAND_PARSERS = {
+    'run-test': add_run_test_parser,
+    'list-results': add_list_results_parser,
+    'generate-report': add_generate_report_parser,
+    'validate-config': add_validate_config_parser,
+}
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -561,35 +767,13 @@ Examples:
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    # Run test command
-    run_parser = subparsers.add_parser('run-test', help='Run a measurement test')
-    run_parser.add_argument('--config', help='Configuration file to load (YAML format)')
-    run_parser.add_argument('--visa-address', help='VISA address of the oscilloscope')
-    run_parser.add_argument('--destination', help='Base destination directory for results')
-    run_parser.add_argument('--board-number', help='Board number for naming')
-    run_parser.add_argument('--label', help='Test label for naming')
-    run_parser.add_argument('--channels', nargs='+', choices=['CH1', 'CH2', 'CH3', 'CH4', 'M1'], 
-                          help='Channels to capture (space-separated)')
-    run_parser.add_argument('--capture-types', nargs='+', 
-                          choices=['measurements', 'waveforms', 'screenshot', 'config', 'html_report'],
-                          help='Types of data to capture (space-separated)')
-    run_parser.add_argument('--no-timestamp', action='store_true', help='Disable automatic timestamping')
-    run_parser.add_argument('--timestamp-format', choices=['YYYYMMDD.HHMMSS', 'YYYYMMDD_HHMMSS'], 
-                          help='Timestamp format')
-    run_parser.add_argument('--save-config', help='Save final configuration to file')
-    
-    # List results command
-    list_parser = subparsers.add_parser('list-results', help='List available test results')
-    list_parser.add_argument('--results-dir', default='captures', help='Directory to search for results')
-    
-    # Generate report command
-    report_parser = subparsers.add_parser('generate-report', help='Generate HTML report from test data')
-    report_parser.add_argument('input_dir', help='Directory containing test data')
-    report_parser.add_argument('--output', help='Output HTML file path')
-    
-    # Validate config command
-    validate_parser = subparsers.add_parser('validate-config', help='Validate a configuration file')
-    validate_parser.add_argument('config', help='Configuration file to validate')
+    # Only build the parser of the requested command; build them all for --help or an unknown command
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in COMMAND_PARSERS:
+        COMMAND_PARSERS[command](subparsers)
+    else:
+        for add_command_parser in COMMAND_PARSERS.values():
+            add_command_parser(subparsers)
     
     args = parser.parse_args()
     
@@ -599,6 +783,7 @@ Examples:
     
     try:
         if args.command == 'run-test':
+            import asyncio
             return asyncio.run(cmd_run_test(args))
         elif args.command == 'list-results':
             return cmd_list_results(args)
@@ -611,6 +796,7 @@ Examples:
         return 1
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
+        import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
         return 1
 
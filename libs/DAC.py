@@ -3,23 +3,34 @@ import time
 
 from colorama import init, Fore
 
-_delay = 1  # in seconds
+_delay = 1  # in seconds, settling time after SET and reply timeout for MEAS
+_colorama_ready = False  # colorama's stream wrapping is process-wide, set it up once
+
+# Encoded MEAS queries for the items exposed through get()
+_meas_commands = {item: bytes('MEAS:%s?\n' % (item),'utf-8')
+                  for item in ("DACA", "DACB", "DACC", "DACD", "VOLT", "CURR")}
 
 class DAC:
-    def __init__(self):
+    def __init__(self, port='COM10', baudrate=115200):
 
-        color = init(autoreset=True)
+        global _colorama_ready
+        if not _colorama_ready:
+            init(autoreset=True)
+            _colorama_ready = True
 
         try:
-            self.ser = serial.Serial(port='COM10',baudrate=115200,timeout=.1)
+            # readline() returns as soon as a reply line is complete, or after _delay
+            self.ser = serial.Serial(port=port,baudrate=baudrate,timeout=_delay)
             time.sleep(3)
+            # Drop anything the Arduino printed while booting so it is not read as a reply
+            self.ser.reset_input_buffer()
             self.status = "Connected"
             
-            print(Fore.GREEN + 'Connected to DAC and INA226 through Arduino on COM10')
+            print(Fore.GREEN + 'Connected to DAC and INA226 through Arduino on %s' % (port))
 
-        except:
+        except serial.SerialException as e:
             self.status = "Not Connected"
-            print(Fore.RED + "Error! Failed to connect to DAC and INA226 through Arduino on COM10")
+            print(Fore.RED + "Error! Failed to connect to DAC and INA226 through Arduino on %s: %s" % (port,e))
 
     def set_value(self, item, val):
         # define a SET VOLTAGE function
@@ -45,11 +56,9 @@ class DAC:
 
     def meas(self,item):
 
-        command = 'MEAS:%s?\n' % (item)
+        command = _meas_commands.get(item) or bytes('MEAS:%s?\n' % (item),'utf-8')
 
-        self.ser.write(bytes(command,'utf-8'))
-        time.sleep(_delay)
-        val = self.ser.readline()
-        val = val[0:(len(val)-2)]
-        val = float(val)
+        self.ser.write(command)
+        # float() accepts the bytes reply directly; rstrip drops the line ending
+        val = float(self.ser.readline().rstrip())
         return (val,0)
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pyvisa
-import statistics
+import time
 import numpy
 try:
     from .loading import *
@@ -9,6 +9,39 @@ except:
 from colorama import init, Fore, Back
 
 _DELAY = 0.05
+_MODE_CACHE_TTL = 0.25  # seconds a mode/setpoint reading is reused for status printouts
+_OPC_TIMEOUT_MS = 1000  # ms to wait for *OPC? before falling back to _DELAY
+
+# Mode -> (setpoint getter, unit column) for the status printouts
+_MODE_SETPOINTS = { 'CC' : ('get_cc_current',    'A  '),
+                    'CR' : ('get_cr_resistance', 'OHM'),
+                    'CV' : ('get_cv_voltage',    'V  '),
+                    'CP' : ('get_cp_power',      'W  ') }
+
+# SCPI queries and fixed commands
+_CMD_MEAS_VOLT     = ':MEAS:VOLT?'
+_CMD_MEAS_CURR     = ':MEAS:CURR?'
+_CMD_MEAS_POW      = ':MEAS:POW?'
+_CMD_MEAS_RES      = ':MEAS:RES?'
+_CMD_INPUT_STAT    = ':SOURCE:INPUT:STAT?'
+_CMD_INPUT_ON      = ':SOURCE:INPUT:STAT ON'
+_CMD_INPUT_OFF     = ':SOURCE:INPUT:STAT OFF'
+_CMD_MODE          = ':SOURCE:FUNCTION?'
+_CMD_CC_CURRENT    = ':SOURCE:CURRENT:LEV:IMM?'
+_CMD_CR_RESISTANCE = ':SOURCE:RES:LEV:IMM?'
+_CMD_CP_POWER      = ':SOURCE:POWER:LEV:IMM?'
+_CMD_CV_VOLTAGE    = ':SOURCE:VOLT:LEV:IMM?'
+_CMD_SENSE_ON      = ':OUTP:SENS ON'
+_CMD_SENSE_OFF     = ':OUTP:SENS OFF'
+
+# SCPI setting templates, filled in with %
+_FMT_SLEW_RATE     = ':SOURCE:CURRENT:SLEW %s'
+_FMT_MODE          = ':SOURCE:FUNCTION %s'
+_FMT_CC_CURRENT    = ':SOURCE:CURRENT:LEV:IMM %s'
+_FMT_CR_RESISTANCE = ':SOURCE:RES:LEV:IMM %s'
+_FMT_CP_POWER      = ':SOURCE:POWER:LEV:IMM %s'
+_FMT_CV_VOLTAGE    = ':SOURCE:VOLT:LEV:IMM %s'
+_FMT_CP_ILIM       = ':SOURCE:POWER:ILIM %s'
 
 resources = pyvisa.ResourceManager()
 
@@ -17,6 +50,7 @@ class DL3021:
 
         color = init(autoreset=True)
         self.loading = loading()
+        self._mode_cache = None
 
         try:
             self.resources = pyvisa.ResourceManager()
@@ -37,6 +71,20 @@ class DL3021:
             self.status = "Not Connected"
             print(Fore.RED + "Error! PyVISA is not able to find any devices")
 
+    def _sync(self):
+        # wait until the load has executed the preceding command (*OPC? answers once it has),
+        # falling back to the fixed delay if the query times out. A timed-out query is cleared
+        # so a late '1' is not read back as the answer to the next query
+        timeout = self.device.timeout
+        self.device.timeout = _OPC_TIMEOUT_MS
+        try:
+            self.device.query('*OPC?')
+        except pyvisa.errors.VisaIOError:
+            self.device.clear()
+            self.loading.delay_with_loading_indicator(_DELAY)
+        finally:
+            self.device.timeout = timeout
+
     def get(self,item,channel=1):
 
         items = { "VOLT"    :self.measure_voltage,
@@ -57,7 +105,7 @@ class DL3021:
 
     def measure_voltage(self):
         # define a MEASURE VOLTAGE function
-        command = ':MEAS:VOLT?'
+        command = _CMD_MEAS_VOLT
         volt = self.device.query(command)
         volt = float(volt)
         self.loading.delay_with_loading_indicator(_DELAY)
@@ -65,7 +113,7 @@ class DL3021:
 
     def measure_current(self):
         # define a MEASURE CURRENT function
-        command = ':MEAS:CURR?'
+        command = _CMD_MEAS_CURR
         curr = self.device.query(command)
         curr = float(curr)
         self.loading.delay_with_loading_indicator(_DELAY)
@@ -73,7 +121,7 @@ class DL3021:
 
     def measure_power(self):
         # define a MEASURE POWER function
-        command = ':MEAS:POW?'
+        command = _CMD_MEAS_POW
         power = self.device.query(command)
         power = float(power)
         self.loading.delay_with_loading_indicator(_DELAY)
@@ -81,7 +129,7 @@ class DL3021:
 
     def measure_resistance(self):
         # define a MEASURE RESISTANCE function
-        command = ':MEAS:RES?'
+        command = _CMD_MEAS_RES
         res = self.device.query(command)
         res = float(res)
         self.loading.delay_with_loading_indicator(_DELAY)
@@ -89,164 +137,173 @@ class DL3021:
 
     def set_slew_rate(self, val):
         # define a SET SLEW RATE function
-        command = ':SOURCE:CURRENT:SLEW %s' % val
+        command = _FMT_SLEW_RATE % val
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def is_enabled(self):
         # define a IS ENABLED function
-        command = ':SOURCE:INPUT:STAT?'
+        command = _CMD_INPUT_STAT
         enabled = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return enabled
 
     def enable(self):
         # define a ENABLE function
-        mode = self.query_mode()
-        if mode == 'CC':
-            modeString = ' %s MODE | %.2f A   '%(mode,self.get_cc_current())
-        elif mode == 'CR':
-            modeString = ' %s MODE | %.2f OHM '%(mode,self.set_cr_resistance())
-        elif mode == 'CV':
-            modeString = ' %s MODE | %.2f V   '%(mode,self.set_cv_voltage())
-        elif mode == 'CP':
-            modeString = ' %s MODE | %.2f W   '%(mode,self.set_cp_power())
+        modeString = self._mode_string()
         print(Back.WHITE + Fore.BLACK +'\rProgrammable Load (DL3021):\t'\
              + Back.GREEN + ' ON ' + Back.BLUE + Fore.WHITE + "%s"%modeString)
-        command = ':SOURCE:INPUT:STAT ON'
+        command = _CMD_INPUT_ON
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def disable(self):
         # define a DISABLE function
         print(Back.WHITE + Fore.BLACK +'\rProgrammable Load (DL3021):\t' + Back.RED + ' OFF ')
-        command = ':SOURCE:INPUT:STAT OFF'
+        command = _CMD_INPUT_OFF
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def input_status(self):
         # define a DISABLE function
-        command = ':SOURCE:INPUT:STAT?'
+        command = _CMD_INPUT_STAT
         result = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
-        mode = self.query_mode()
+        modeString = self._mode_string()
 
         print(Back.WHITE + Fore.BLACK +'\rProgrammable Load (DL3021):\t', end = '')
         if result == 0:
             print(Back.RED + ' OFF ', end = '')
         else:
             print(Back.GREEN + ' ON ', end = '')
-        if mode == 'CC':
-            modeString = ' %s MODE | %.2f A   '%(mode,self.get_cc_current())
-        elif mode == 'CR':
-            modeString = ' %s MODE | %.2f OHM '%(mode,self.set_cr_resistance())
-        elif mode == 'CV':
-            modeString = ' %s MODE | %.2f V   '%(mode,self.set_cv_voltage())
-        elif mode == 'CP':
-            modeString = ' %s MODE | %.2f W   '%(mode,self.set_cp_power())
         print(Back.BLUE + Fore.WHITE + "%s"%modeString)
         
         return result[0:(len(result)-1)]
 
+    def _mode_string(self):
+        # describe the active mode and its setpoint, reusing a reading taken within _MODE_CACHE_TTL
+        now = time.monotonic()
+        if self._mode_cache is not None and now - self._mode_cache[0] < _MODE_CACHE_TTL:
+            return self._mode_cache[1]
+        mode = self.query_mode()
+        if mode in _MODE_SETPOINTS:
+            getter, unit = _MODE_SETPOINTS[mode]
+            modeString = ' %s MODE | %.2f %s '%(mode,getattr(self,getter)(),unit)
+        else:
+            modeString = ' %s MODE '%(mode)
+        self._mode_cache = (now, modeString)
+        return modeString
+
     def select_mode(self, mode):
         # define a SELECT MODE function (CURR, RES, VOLT, POW)
-        command = ':SOURCE:FUNCTION %s' % mode
+        command = _FMT_MODE % mode
+        self._mode_cache = None
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def query_mode(self):
         # define a QUERY MODE function
-        command = ':SOURCE:FUNCTION?'
+        command = _CMD_MODE
         mode = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return mode[0:(len(mode)-1)]
 
     def set_cc_current(self, val):
         # define a SET CC CURRENT function
-        command = ':SOURCE:CURRENT:LEV:IMM %s' % val
+        command = _FMT_CC_CURRENT % val
+        self._mode_cache = None
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def set_cr_resistance(self, val):
         # define a SET CR RESISTANCE function
-        command = ':SOURCE:RES:LEV:IMM %s' % val
+        command = _FMT_CR_RESISTANCE % val
+        self._mode_cache = None
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)        
+        self._sync()        
 
     def set_cp_power(self, val):
         # define a SET CP POWER function
-        command = ':SOURCE:POWER:LEV:IMM %s' % val
+        command = _FMT_CP_POWER % val
+        self._mode_cache = None
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def set_cv_voltage(self, val):
         # define a SET CV VOLTAGE function
-        command = ':SOURCE:VOLT:LEV:IMM %s' % val
+        command = _FMT_CV_VOLTAGE % val
+        self._mode_cache = None
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def set_cp_ilim(self, val):
         # define a SET CP CURRENT LIMIT function
-        command = ':SOURCE:POWER:ILIM %s' % val
+        command = _FMT_CP_ILIM % val
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def get_cc_current(self):
         # define a SET CC CURRENT function
-        command = ':SOURCE:CURRENT:LEV:IMM?'
+        command = _CMD_CC_CURRENT
         value = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return float(value)
     
     def get_cr_resistance(self):
         # define a SET CR RESISTANCE function
-        command = ':SOURCE:RES:LEV:IMM?'
+        command = _CMD_CR_RESISTANCE
         value = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return float(value)
 
     def get_cp_power(self):
         # define a SET CP POWER function
-        command = ':SOURCE:POWER:LEV:IMM?'
+        command = _CMD_CP_POWER
         value = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return float(value)
 
     def get_cv_voltage(self):
         # define a SET CV VOLTAGE function
-        command = ':SOURCE:VOLT:LEV:IMM?'
+        command = _CMD_CV_VOLTAGE
         value = self.device.query(command)
         self.loading.delay_with_loading_indicator(_DELAY)
         return float(value)
 
     def measure_current_avg(self,n=50):
 
-        val = numpy.zeros(n)
+        if n < 2:
+            raise ValueError("Averaging needs at least 2 samples for a standard deviation, got n=%s" % n)
+        val = []
         for x in range(n):
             self.loading.display_loading_bar(x/n,loading_text="Averaging measurements from DL3021 Load")
-            self.loading.delay_with_loading_indicator(_DELAY)
-            val[x]=self.measure_current()
+            # measure_current() already waits _DELAY after its query, which spaces the samples
+            val.append(self.measure_current())
 
-        return (statistics.fmean(val),statistics.stdev(val))
+        val = numpy.asarray(val, dtype=float)
+        return (float(val.mean()),float(val.std(ddof=1)))
 
     def measure_volt_avg(self,n=10):
 
-        val = numpy.zeros(n)
+        if n < 2:
+            raise ValueError("Averaging needs at least 2 samples for a standard deviation, got n=%s" % n)
+        val = []
         for x in range(n):
             self.loading.display_loading_bar(x/n,loading_text="Averaging measurements from DL3021 Load")
-            self.loading.delay_with_loading_indicator(_DELAY)
-            val[x]=self.measure_voltage()
+            # measure_voltage() already waits _DELAY after its query, which spaces the samples
+            val.append(self.measure_voltage())
 
-        return (statistics.fmean(val),statistics.stdev(val))
+        val = numpy.asarray(val, dtype=float)
+        return (float(val.mean()),float(val.std(ddof=1)))
     
     def configure_output_sense(self, val = True):
         # define a CHANNEL SELECT function
         if val == True:
-            command = ':OUTP:SENS ON'
+            command = _CMD_SENSE_ON
         elif val == False:
-            command = ':OUTP:SENS OFF'
+            command = _CMD_SENSE_OFF
         self.device.write(command)
-        self.loading.delay_with_loading_indicator(_DELAY)
+        self._sync()
 
     def reset(self):
         return self.device.write("*RST")
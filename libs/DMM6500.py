@@ -27,6 +27,12 @@ except Exception:
 _ERROR_STYLE   = Fore.RED + Style.BRIGHT + "\rError! "
 _SUCCESS_STYLE = Fore.GREEN + Style.BRIGHT + "\r"
 _DELAY         = 0.1
+_OPC_TIMEOUT_MS = 1000  # ms _sync() waits for *OPC? (the session timeout is 20 s)
+
+# Auto-detect: Keithley USB vendor ID and the timeouts (ms) used while probing candidates
+_KEITHLEY_VID     = "0X05E6"
+_OPEN_TIMEOUT_MS  = 500
+_PROBE_TIMEOUT_MS = 2000
 
 
 def _strip_quotes(s: str) -> str:
@@ -97,23 +103,26 @@ class DMM6500:
                 raise ConnectionError(_ERROR_STYLE +
                     f"Failed to open explicit address '{explicit}': {e}")
 
-        # 2) Otherwise scan for resources with '6500' in the name
+        # 2) Otherwise scan for resources with '6500' in the name (USB0::0x05E6::0x6500::...),
+        #    Keithley-VID entries first, probing each with short timeouts
         if self.instrument is None:
-            for resource in self.rm.list_resources():
-                if "6500" in resource:
-                    try:
-                        inst = self.rm.open_resource(resource)
-                        inst.read_termination = '\n'
-                        inst.write_termination = '\n'
+            candidates = [r for r in self.rm.list_resources() if "6500" in r]
+            candidates.sort(key=lambda r: _KEITHLEY_VID not in r.upper())
+            for resource in candidates:
+                try:
+                    inst = self.rm.open_resource(resource, open_timeout=_OPEN_TIMEOUT_MS)
+                    inst.read_termination = '\n'
+                    inst.write_termination = '\n'
+                    inst.timeout = _PROBE_TIMEOUT_MS
+                    idn = inst.query("*IDN?").strip()
+                    if "DMM6500" in idn:
                         inst.timeout = 20000
-                        idn = inst.query("*IDN?").strip()
-                        if "DMM6500" in idn:
-                            self.instrument = inst
-                            self.address = resource
-                            break
-                        inst.close()
-                    except Exception:
-                        continue
+                        self.instrument = inst
+                        self.address = resource
+                        break
+                    inst.close()
+                except Exception:
+                    continue
 
         if self.instrument is None:
             raise ConnectionError(_ERROR_STYLE + "Keithley DMM6500 not found.")
@@ -160,7 +169,22 @@ class DMM6500:
         cur = self.get_current_function().upper()
         if fn.upper() not in cur:
             self.instrument.write(f"SENSe:FUNCtion '{fn}'")
+            self._sync()
+
+    def _sync(self) -> None:
+        """Wait until the preceding command has executed (*OPC?), or _DELAY if that query fails.
+
+        A timed-out *OPC? is cleared, so its late reply is not read as the next query's answer.
+        """
+        timeout = self.instrument.timeout
+        self.instrument.timeout = _OPC_TIMEOUT_MS
+        try:
+            self.instrument.query("*OPC?")
+        except pyvisa.errors.VisaIOError:
+            self.instrument.clear()
             self.loading.delay_with_loading_indicator(_DELAY)
+        finally:
+            self.instrument.timeout = timeout
 
     def _read_float_query(self, q: str) -> float:
         self._chk()
@@ -225,21 +249,18 @@ class DMM6500:
           CURRENT:DC  -> CONFigure:CURRent:DC <range>,<resolution>
           RESISTANCE  -> CONFigure:RESistance <range>,<resolution>
           FRESISTANCE -> CONFigure:FRESistance <range>,<resolution>
+        each compounded with the matching SENSe:FUNCtion into a single write.
         """
         self._chk()
         mt = measurement_type.strip().upper()
         if mt in ("VOLTAGE:DC", "VOLT:DC"):
-            self.instrument.write(f"CONFigure:VOLTage:DC {range_val},{resolution_val}")
-            self.instrument.write("SENSe:FUNCtion 'VOLT:DC'")
+            self.instrument.write(f"CONFigure:VOLTage:DC {range_val},{resolution_val};:SENSe:FUNCtion 'VOLT:DC'")
         elif mt in ("CURRENT:DC", "CURR:DC"):
-            self.instrument.write(f"CONFigure:CURRent:DC {range_val},{resolution_val}")
-            self.instrument.write("SENSe:FUNCtion 'CURR:DC'")
+            self.instrument.write(f"CONFigure:CURRent:DC {range_val},{resolution_val};:SENSe:FUNCtion 'CURR:DC'")
         elif mt in ("FRESISTANCE", "FRES"):
-            self.instrument.write(f"CONFigure:FRESistance {range_val},{resolution_val}")
-            self.instrument.write("SENSe:FUNCtion 'FRES'")
+            self.instrument.write(f"CONFigure:FRESistance {range_val},{resolution_val};:SENSe:FUNCtion 'FRES'")
         elif mt in ("RESISTANCE", "RES"):
-            self.instrument.write(f"CONFigure:RESistance {range_val},{resolution_val}")
-            self.instrument.write("SENSe:FUNCtion 'RES'")
+            self.instrument.write(f"CONFigure:RESistance {range_val},{resolution_val};:SENSe:FUNCtion 'RES'")
         else:
             raise ValueError(_ERROR_STYLE + f"Unsupported measurement_type: {measurement_type}")
         print(f"\rConfigured {mt} Range={range_val}, Resolution={resolution_val}")
@@ -25,45 +25,51 @@ MM_REGEX = re.compile(r"MM_(\d+)", re.IGNORECASE)
 def parse_results_txt(txt_path: Path) -> Optional[Tuple[float, float]]:
     """Extract (mean, stddev) for 'Average - Full Screen(1)' from results_*.txt."""
     try:
+        # Single pass over the file: look for the target measurement block and
+        # remember Raw Response lines in case the block isn't there
+        raw_response_lines = []
+        found = False
+        lines_left = 0  # lines still to check after the measurement header
+        mean_val = None
+        std_val = None
         with txt_path.open("r", encoding="utf-8", errors="ignore") as f:
-            lines = [ln.rstrip("\n") for ln in f]
-
-        idx = None
-        for i, ln in enumerate(lines):
-            if ln.strip().startswith("Measurement ") and TARGET_MEAS_LABEL in ln:
-                idx = i
-                break
-
-        if idx is None:
-            for ln in lines:
-                if ln.startswith("Raw Response:"):
-                    parts = [p.strip() for p in ln.split(",")]
-                    for j, token in enumerate(parts):
-                        if token == TARGET_MEAS_LABEL:
-                            try:
-                                mean = float(parts[j+4].replace("+", ""))
-                                std = float(parts[j+5].replace("+", ""))
-                                return (mean, std)
-                            except Exception:
-                                return None
+            for ln in f:
+                if found:
+                    t = ln.strip()
+                    if t.startswith("Mean:"):
+                        try:
+                            mean_val = float(t.split()[-1])
+                        except Exception:
+                            pass
+                    elif t.startswith("Std Dev:"):
+                        try:
+                            std_val = float(t.split()[-1])
+                        except Exception:
+                            pass
+                    if mean_val is not None and std_val is not None:
+                        return (mean_val, std_val)
+                    lines_left -= 1
+                    if not lines_left:
+                        return None
+                elif ln.strip().startswith("Measurement ") and TARGET_MEAS_LABEL in ln:
+                    found = True
+                    lines_left = 11
+                elif ln.startswith("Raw Response:"):
+                    raw_response_lines.append(ln.rstrip("\n"))
+
+        if found:
             return None
 
-        mean_val = None
-        std_val = None
-        for k in range(idx + 1, min(idx + 12, len(lines))):
-            t = lines[k].strip()
-            if t.startswith("Mean:"):
-                try:
-                    mean_val = float(t.split()[-1])
-                except Exception:
-                    pass
-            elif t.startswith("Std Dev:"):
-                try:
-                    std_val = float(t.split()[-1])
-                except Exception:
-                    pass
-            if mean_val is not None and std_val is not None:
-                return (mean_val, std_val)
+        for ln in raw_response_lines:
+            parts = [p.strip() for p in ln.split(",")]
+            for j, token in enumerate(parts):
+                if token == TARGET_MEAS_LABEL:
+                    try:
+                        mean = float(parts[j+4].replace("+", ""))
+                        std = float(parts[j+5].replace("+", ""))
+                        return (mean, std)
+                    except Exception:
+                        return None
         return None
     except Exception:
         return None
@@ -25,16 +25,11 @@ Author: Redlen Technologies Lab Automation Team
 Date: 2025-10
 """
 
-import sys
 import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
 
-# Add current directory to path for imports
-sys.path.append('.')
-from libs.KeysightMSOX4154A import KeysightMSOX4154A
-
 def test_measurement_results(visa_address=None, output_dir="captures", channels=None, no_waveforms=False, no_screenshot=False):
     """
     Test the measurement results query functionality.
@@ -44,6 +39,9 @@ def test_measurement_results(visa_address=None, output_dir="captures", channels=
         output_dir: Directory to save results (default: "captures")
     """
     
+    # Imported here so that --help does not pay for the VISA/instrument imports
+    from libs.KeysightMSOX4154A import KeysightMSOX4154A
+    
     print("Keysight MSOX4154A Measurement Results Test")
     print("=" * 50)
     print("Testing :MEASure:RESults? query functionality")